@@ -0,0 +1,52 @@
+"""
+AES-CTR Throughput Benchmark
+Measures parallel CTR encryption speed from 1 to N worker threads
+
+Usage:
+    python benchmarks/aes_ctr_throughput.py [size_in_mb] [max_workers]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+# Allow running the script directly from the project root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ciphers import aes_cipher
+
+
+def measure(data, workers, repeats=3):
+    """Return the best throughput in MB/s over several runs"""
+    key_bytes = aes_cipher._prepare_key("benchmark-key")
+    nonce = os.urandom(aes_cipher.CTR_NONCE_SIZE)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        aes_cipher._ctr_transform(key_bytes, nonce, data, workers)
+        best = min(best, time.perf_counter() - start)
+    return len(data) / best / (1024 * 1024)
+
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    data = os.urandom(size_mb * 1024 * 1024)
+
+    # Sanity check: every worker count must produce identical output
+    key_bytes = aes_cipher._prepare_key("benchmark-key")
+    nonce = os.urandom(aes_cipher.CTR_NONCE_SIZE)
+    reference = aes_cipher._ctr_transform(key_bytes, nonce, data, 1)
+    assert aes_cipher._ctr_transform(key_bytes, nonce, data, max_workers) == reference
+
+    print(f"AES-256-CTR on {size_mb} MB ({os.cpu_count()} CPU cores available)")
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        throughput = measure(data, workers)
+        baseline = baseline or throughput
+        print(f"  {workers:>2} worker(s): {throughput:8.1f} MB/s  "
+              f"(x{throughput / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
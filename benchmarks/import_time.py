@@ -0,0 +1,63 @@
+"""
+Import-Time Benchmark
+Measures how long a fresh interpreter takes to import each cipher module,
+and to run a one-shot Caesar encryption through the command line
+
+Usage:
+    python benchmarks/import_time.py [repeats]
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+MODULES = [
+    "ciphers",
+    "ciphers.registry",
+    "ciphers.caesar",
+    "ciphers.vigenere",
+    "ciphers.hill",
+    "ciphers.des_cipher",
+    "ciphers.aes_cipher",
+    "cryptotool.cli",
+]
+
+
+def measure(args, repeats, stdin=None):
+    """Return the best wall time in milliseconds of running python with args"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, input=stdin,
+                       stdout=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # Interpreter start-up alone, subtracted from every other figure
+    baseline = measure(["-c", "pass"], repeats)
+    print(f"Python start-up: {baseline:.1f} ms (subtracted below)")
+
+    for module in MODULES:
+        elapsed = measure(["-c", f"import {module}"], repeats)
+        print(f"  import {module:<20} {elapsed - baseline:7.1f} ms")
+
+    elapsed = measure(["-m", "cryptotool", "encrypt", "--cipher", "caesar", "--key", "3"],
+                      repeats, stdin=b"HELLO WORLD")
+    print(f"  {'caesar one-shot (CLI)':<27} {elapsed - baseline:7.1f} ms")
+
+    # The heavy dependencies must stay out of the cheap paths
+    check = ("import sys, cryptotool.cli, ciphers.caesar, ciphers.aes_cipher, ciphers.hill; "
+             "heavy = [m for m in ('numpy', 'Crypto', 'customtkinter') if m in sys.modules]; "
+             "assert not heavy, heavy")
+    subprocess.run([sys.executable, "-c", check], cwd=ROOT, check=True)
+    print("No NumPy, PyCryptodome or customtkinter loaded by the module imports")
+
+
+if __name__ == "__main__":
+    main()
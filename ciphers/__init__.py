@@ -1 +1,29 @@
 # Ciphers package
+"""
+Cipher modules are imported on first attribute access, so `import ciphers`
+stays cheap and NumPy/PyCryptodome only load for the ciphers that need them.
+
+The cipher modules follow the same rule: NumPy and PyCryptodome are
+imported inside the functions that use them, never at module level, so
+importing a cipher module (e.g. for the registry, the CLI or `list`) does
+not pay for them. test_lazy_imports guards this.
+"""
+import importlib
+
+_SUBMODULES = (
+    "caesar", "monoalphabetic", "playfair", "vigenere", "otp", "hill",
+    "row_transposition", "permutation", "des_cipher", "aes_cipher",
+    "analysis", "batch", "buffers", "keycache", "parallel", "registry", "vectorized",
+)
+
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
@@ -2,81 +2,322 @@
 AES Cipher Implementation
 Uses PyCryptodome for AES-256 encryption
 """
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
-from Crypto.Random import get_random_bytes
 import binascii
+from .buffers import as_bytes_view, prepare_output, finish_output, unpadded_length
+from .keycache import KeyCache
+from .parallel import resolve_workers, split_segments, run_segments
 
-def encrypt(text, key):
+# Block size in bytes (PyCryptodome is imported lazily, see ciphers/__init__.py)
+BLOCK_SIZE = 16
+
+# Default number of bytes read per iteration by the streaming API
+CHUNK_SIZE = 64 * 1024
+
+# CTR mode uses an 8-byte nonce followed by an 8-byte block counter
+CTR_NONCE_SIZE = 8
+
+
+def _prepare_key(key):
+    """Pad or truncate the key to the 32 bytes required by AES-256"""
+    key_bytes = key.encode('utf-8')
+    if len(key_bytes) < 32:
+        key_bytes = key_bytes + b'0' * (32 - len(key_bytes))
+    elif len(key_bytes) > 32:
+        key_bytes = key_bytes[:32]
+    return key_bytes
+
+
+# Prepared key bytes for recently used keys (see key_cache.info())
+key_cache = KeyCache(_prepare_key)
+
+
+def encrypted_length(length):
+    """Return the size of encrypt_bytes output (IV + padded data) for a plain length"""
+    return BLOCK_SIZE + (length // BLOCK_SIZE + 1) * BLOCK_SIZE
+
+
+def encrypt_bytes(data, key, out=None):
     """
-    Encrypt text using AES-256
+    Encrypt raw bytes using AES-256 in CBC mode
     Args:
-        text: Plain text to encrypt
+        data: bytes, bytearray or memoryview to encrypt
         key: Key (will be hashed to 32 bytes for AES-256)
+        out: Optional writable buffer of at least encrypted_length(len(data)) bytes
     Returns:
-        Encrypted text in hexadecimal (includes IV)
+        IV followed by the ciphertext (bytearray, or a memoryview over out)
     """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad
+    from Crypto.Random import get_random_bytes
     try:
-        # Prepare key (AES-256 requires 32 bytes)
-        key_bytes = key.encode('utf-8')
-        if len(key_bytes) < 32:
-            key_bytes = key_bytes + b'0' * (32 - len(key_bytes))
-        elif len(key_bytes) > 32:
-            key_bytes = key_bytes[:32]
+        data = as_bytes_view(data)
+        size = encrypted_length(len(data))
+        buffer, view = prepare_output(out, size)
         
-        # Generate random IV
-        iv = get_random_bytes(AES.block_size)
+        # Generate random IV and write it first
+        iv = get_random_bytes(BLOCK_SIZE)
+        view[:BLOCK_SIZE] = iv
+        cipher = AES.new(key_cache.get(key), AES.MODE_CBC, iv)
         
-        # Create cipher
-        cipher = AES.new(key_bytes, AES.MODE_CBC, iv)
+        # Whole blocks are encrypted in place, only the tail is copied for padding
+        full = len(data) - len(data) % BLOCK_SIZE
+        if full:
+            cipher.encrypt(data[:full], output=view[BLOCK_SIZE:BLOCK_SIZE + full])
+        cipher.encrypt(pad(data[full:].tobytes(), BLOCK_SIZE),
+                       output=view[BLOCK_SIZE + full:])
         
-        # Pad and encrypt
-        text_bytes = text.encode('utf-8')
-        padded_text = pad(text_bytes, AES.block_size)
-        encrypted = cipher.encrypt(padded_text)
+        return finish_output(out, buffer, view, size)
+    
+    except Exception as e:
+        raise ValueError(f"AES encryption error: {str(e)}")
+
+
+def _cbc_decrypt(key_bytes, iv, ciphertext, output, workers=1):
+    """
+    Decrypt CBC ciphertext into output (without unpadding), in parallel when asked to
+    Each plaintext block only depends on its own ciphertext block and the
+    previous one, so every segment can start from the block before it.
+    """
+    from Crypto.Cipher import AES
+    if len(ciphertext) % BLOCK_SIZE:
+        raise ValueError("Ciphertext length is not a multiple of the block size")
+    
+    workers = resolve_workers(workers)
+    segments = split_segments(len(ciphertext), BLOCK_SIZE, workers)
+    
+    def decrypt_segment(start, end):
+        segment_iv = iv if start == 0 else ciphertext[start - BLOCK_SIZE:start]
+        cipher = AES.new(key_bytes, AES.MODE_CBC, segment_iv)
+        cipher.decrypt(ciphertext[start:end], output=output[start:end])
+    
+    run_segments(decrypt_segment, segments, workers)
+
+
+def decrypt_bytes(data, key, out=None, workers=1):
+    """
+    Decrypt raw bytes produced by encrypt_bytes
+    Args:
+        data: IV followed by the ciphertext (bytes, bytearray or memoryview)
+        key: Key used for encryption
+        out: Optional writable buffer of at least len(data) - 16 bytes
+        workers: Number of threads for large ciphertexts (None for one per core)
+    Returns:
+        Plain bytes (bytearray, or a memoryview over out)
+    """
+    try:
+        data = as_bytes_view(data)
+        if len(data) < BLOCK_SIZE:
+            raise ValueError("Ciphertext is too short to contain an IV")
+        
+        # Extract IV and ciphertext without copying
+        iv = data[:BLOCK_SIZE]
+        ciphertext = data[BLOCK_SIZE:]
+        buffer, view = prepare_output(out, len(ciphertext))
         
-        # Combine IV and encrypted text
-        result = iv + encrypted
+        # Decrypt (only the final block carries padding)
+        _cbc_decrypt(key_cache.get(key), iv, ciphertext, view, workers)
+        length = unpadded_length(view, BLOCK_SIZE)
         
-        # Return as hex string
-        return binascii.hexlify(result).decode('utf-8')
+        return finish_output(out, buffer, view, length)
     
+    except Exception as e:
+        raise ValueError(f"AES decryption error: {str(e)}")
+
+
+def encrypt(text, key):
+    """
+    Encrypt text using AES-256
+    Args:
+        text: Plain text to encrypt
+        key: Key (will be hashed to 32 bytes for AES-256)
+    Returns:
+        Encrypted text in hexadecimal (includes IV)
+    """
+    try:
+        text_bytes = text.encode('utf-8')
     except Exception as e:
         raise ValueError(f"AES encryption error: {str(e)}")
+    
+    # Return as hex string
+    return binascii.hexlify(encrypt_bytes(text_bytes, key)).decode('utf-8')
 
 
-def decrypt(text, key):
+def decrypt(text, key, workers=1):
     """
     Decrypt text using AES-256
     Args:
         text: Cipher text in hexadecimal (includes IV)
         key: Key used for encryption
+        workers: Number of threads for large ciphertexts (None for one per core)
     Returns:
         Decrypted text
     """
     try:
-        # Prepare key
-        key_bytes = key.encode('utf-8')
-        if len(key_bytes) < 32:
-            key_bytes = key_bytes + b'0' * (32 - len(key_bytes))
-        elif len(key_bytes) > 32:
-            key_bytes = key_bytes[:32]
-        
-        # Decode hex
         encrypted_data = binascii.unhexlify(text)
+    except Exception as e:
+        raise ValueError(f"AES decryption error: {str(e)}")
+    
+    decrypted = decrypt_bytes(encrypted_data, key, workers=workers)
+    
+    try:
+        return decrypted.decode('utf-8')
+    except Exception as e:
+        raise ValueError(f"AES decryption error: {str(e)}")
+
+
+def encrypt_stream(infile, outfile, key, chunk_size=CHUNK_SIZE):
+    """
+    Encrypt a binary stream using AES-256 in CBC mode
+    Args:
+        infile: Readable binary file-like object with the plain data
+        outfile: Writable binary file-like object for the result
+        key: Key (will be hashed to 32 bytes for AES-256)
+        chunk_size: Number of bytes read from infile per iteration
+    Returns:
+        Number of bytes written (raw binary, IV header first)
+    """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad
+    from Crypto.Random import get_random_bytes
+    try:
+        key_bytes = key_cache.get(key)
+        iv = get_random_bytes(BLOCK_SIZE)
         
-        # Extract IV and ciphertext
-        iv = encrypted_data[:AES.block_size]
-        ciphertext = encrypted_data[AES.block_size:]
+        # A single cipher object carries the CBC chain across chunks
+        cipher = AES.new(key_bytes, AES.MODE_CBC, iv)
+        outfile.write(iv)
+        written = len(iv)
+        
+        # Encrypt whole blocks as they arrive, keeping back the partial tail
+        tail = b''
+        while True:
+            chunk = infile.read(chunk_size)
+            if not chunk:
+                break
+            if tail:
+                chunk = tail + chunk
+            full = len(chunk) - len(chunk) % BLOCK_SIZE
+            tail = chunk[full:]
+            if full:
+                written += outfile.write(cipher.encrypt(chunk[:full]))
+        
+        # Padding is only ever applied to the final block
+        written += outfile.write(cipher.encrypt(pad(tail, BLOCK_SIZE)))
+        return written
+    
+    except Exception as e:
+        raise ValueError(f"AES encryption error: {str(e)}")
+
+
+def decrypt_stream(infile, outfile, key, chunk_size=CHUNK_SIZE):
+    """
+    Decrypt a binary stream produced by encrypt_stream
+    Args:
+        infile: Readable binary file-like object (IV header first)
+        outfile: Writable binary file-like object for the plain data
+        key: Key used for encryption
+        chunk_size: Number of bytes read from infile per iteration
+    Returns:
+        Number of plain bytes written
+    """
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import unpad
+    try:
+        key_bytes = key_cache.get(key)
+        iv = infile.read(BLOCK_SIZE)
+        if len(iv) != BLOCK_SIZE:
+            raise ValueError("Stream is too short to contain an IV")
         
-        # Create cipher
         cipher = AES.new(key_bytes, AES.MODE_CBC, iv)
+        written = 0
+        
+        # The last block is held back until EOF so it can be unpadded
+        tail = b''
+        while True:
+            chunk = infile.read(chunk_size)
+            if not chunk:
+                break
+            if tail:
+                chunk = tail + chunk
+            ready = len(chunk) - len(chunk) % BLOCK_SIZE
+            if ready == len(chunk):
+                ready -= BLOCK_SIZE
+            tail = chunk[ready:]
+            if ready:
+                written += outfile.write(cipher.decrypt(chunk[:ready]))
         
-        # Decrypt
-        decrypted = cipher.decrypt(ciphertext)
-        unpadded = unpad(decrypted, AES.block_size)
+        if len(tail) != BLOCK_SIZE:
+            raise ValueError("Ciphertext length is not a multiple of the block size")
+        written += outfile.write(unpad(cipher.decrypt(tail), BLOCK_SIZE))
+        return written
+    
+    except Exception as e:
+        raise ValueError(f"AES decryption error: {str(e)}")
+
+
+def _ctr_transform(key_bytes, nonce, data, workers=None):
+    """
+    Apply the AES-CTR keystream to data on several threads
+    Each segment starts its counter at its own block offset, so the
+    stitched output is byte-identical to a single CTR pass.
+    """
+    from Crypto.Cipher import AES
+    data = memoryview(data)
+    output = bytearray(len(data))
+    output_view = memoryview(output)
+    workers = resolve_workers(workers)
+    segments = split_segments(len(data), BLOCK_SIZE, workers)
+    
+    def transform_segment(start, end):
+        cipher = AES.new(key_bytes, AES.MODE_CTR, nonce=nonce,
+                         initial_value=start // BLOCK_SIZE)
+        cipher.encrypt(data[start:end], output=output_view[start:end])
+    
+    run_segments(transform_segment, segments, workers)
+    return output
+
+
+def encrypt_ctr(text, key, workers=None):
+    """
+    Encrypt text using AES-256 in CTR mode, in parallel for large inputs
+    Args:
+        text: Plain text to encrypt
+        key: Key (will be hashed to 32 bytes for AES-256)
+        workers: Number of threads (defaults to one per CPU core)
+    Returns:
+        Encrypted text in hexadecimal (includes nonce)
+    """
+    from Crypto.Random import get_random_bytes
+    try:
+        key_bytes = key_cache.get(key)
+        nonce = get_random_bytes(CTR_NONCE_SIZE)
+        encrypted = _ctr_transform(key_bytes, nonce, text.encode('utf-8'), workers)
+        return binascii.hexlify(nonce + encrypted).decode('utf-8')
+    
+    except Exception as e:
+        raise ValueError(f"AES encryption error: {str(e)}")
+
+
+def decrypt_ctr(text, key, workers=None):
+    """
+    Decrypt text encrypted with encrypt_ctr
+    Args:
+        text: Cipher text in hexadecimal (includes nonce)
+        key: Key used for encryption
+        workers: Number of threads (defaults to one per CPU core)
+    Returns:
+        Decrypted text
+    """
+    try:
+        key_bytes = key_cache.get(key)
+        encrypted_data = binascii.unhexlify(text)
+        if len(encrypted_data) < CTR_NONCE_SIZE:
+            raise ValueError("Cipher text is too short to contain a nonce")
         
-        return unpadded.decode('utf-8')
+        nonce = encrypted_data[:CTR_NONCE_SIZE]
+        ciphertext = memoryview(encrypted_data)[CTR_NONCE_SIZE:]
+        decrypted = _ctr_transform(key_bytes, nonce, ciphertext, workers)
+        return decrypted.decode('utf-8')
     
     except Exception as e:
         raise ValueError(f"AES decryption error: {str(e)}")
@@ -0,0 +1,267 @@
+"""
+Frequency Analysis
+Letter statistics shared by the cipher crackers (NumPy, imported on first use)
+"""
+import hashlib
+import math
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+# Relative frequency of A-Z in English text
+ENGLISH_FREQUENCIES = (
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015,
+    0.06094, 0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749,
+    0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758,
+    0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+)
+
+# Index of coincidence of English text and of uniformly random letters
+ENGLISH_IOC = 0.0667
+RANDOM_IOC = 1 / 26
+
+# Bundled English sample (about 21 KB: enough for tests and demos, too small
+# for a good quadgram table, which should be trained on a real corpus)
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+ENGLISH_SAMPLE = os.path.join(DATA_DIR, 'english_sample.txt')
+
+# One ranked cracking result: the recovered key, its score and the plaintext
+Candidate = namedtuple("Candidate", ["key", "score", "plaintext"])
+
+
+def letter_codes(text):
+    """
+    Return the letters of text as a NumPy array of codes 0-25 (A=0)
+    Case is folded and every other character is dropped.
+    """
+    import numpy as np
+    if isinstance(text, str):
+        text = text.upper().encode('ascii', 'ignore')
+    else:
+        text = bytes(text).upper()
+    data = np.frombuffer(text, dtype=np.uint8)
+    return data[(data >= 65) & (data <= 90)] - 65
+
+
+def letter_counts(text):
+    """Return the 26-bin letter histogram of text"""
+    import numpy as np
+    return np.bincount(letter_codes(text), minlength=26)
+
+
+def letter_counts_many(texts):
+    """
+    Return the letter histograms of many texts as one (len(texts), 26) array
+    All texts are joined into a single buffer and counted with one bincount.
+    """
+    import numpy as np
+    encoded = [text.upper().encode('ascii', 'ignore') if isinstance(text, str)
+               else bytes(text).upper() for text in texts]
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    owners = np.repeat(np.arange(len(encoded)), [len(e) for e in encoded])
+    letters = (data >= 65) & (data <= 90)
+    bins = owners[letters] * 26 + (data[letters] - 65)
+    return np.bincount(bins, minlength=len(encoded) * 26).reshape(len(encoded), 26)
+
+
+def chi_squared_shifts(counts):
+    """
+    Chi-squared distance from English for every Caesar decryption shift
+    Decrypting with shift s moves ciphertext letter (i + s) to plaintext
+    letter i, so every candidate histogram is a rotation of counts and no
+    text is ever re-decrypted.
+    Args:
+        counts: Letter histogram(s), shape (26,) or (n, 26)
+    Returns:
+        Scores of shape (..., 26), indexed by shift (lower is more English)
+    """
+    import numpy as np
+    counts = np.asarray(counts, dtype=np.float64)
+    rotations = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+    rotated = counts[..., rotations]                      # (..., shift, letter)
+    totals = np.maximum(counts.sum(axis=-1), 1)[..., None, None]
+    expected = totals * np.asarray(ENGLISH_FREQUENCIES)
+    return ((rotated - expected) ** 2 / expected).sum(axis=-1)
+
+
+def index_of_coincidence(counts):
+    """
+    Probability that two letters drawn from the histogram(s) are equal
+    About 0.066 for English and 0.038 for uniformly random letters.
+    Args:
+        counts: Letter histogram(s), shape (26,) or (n, 26)
+    Returns:
+        Index of coincidence per histogram
+    """
+    import numpy as np
+    counts = np.asarray(counts, dtype=np.float64)
+    totals = counts.sum(axis=-1)
+    pairs = (counts * (counts - 1)).sum(axis=-1)
+    return pairs / np.maximum(totals * (totals - 1), 1)
+
+
+def column_counts(codes, period):
+    """
+    Letter histograms of the period interleaved columns of a letter-code array
+    The columns are strided views (letter i belongs to column i % period),
+    so splitting never copies the text.
+    Args:
+        codes: 1-D array of letter codes 0-25
+        period: Number of columns (e.g. a Vigenère key length)
+    Returns:
+        Array of shape (period, 26)
+    """
+    import numpy as np
+    from numpy.lib.stride_tricks import as_strided
+    codes = np.ascontiguousarray(codes)
+    rows = len(codes) // period
+    step = codes.strides[0]
+    columns = as_strided(codes, shape=(period, rows), strides=(step, step * period),
+                         writeable=False)
+    return np.stack([np.bincount(column, minlength=26) for column in columns])
+
+
+def kasiski_scores(codes, periods):
+    """
+    Kasiski examination: how strongly repeated trigrams favour each period
+    Distances between consecutive repeats of a trigram tend to be multiples
+    of the key length; chance repeats only hit a period p one time in p.
+    Args:
+        codes: 1-D array of letter codes 0-25
+        periods: Candidate periods (all >= 1)
+    Returns:
+        Array with, per period, the share of repeat distances it divides in
+        excess of chance (0 when there are no repeats or for period 1)
+    """
+    import numpy as np
+    periods = np.asarray(periods)
+    codes = np.asarray(codes, dtype=np.int64)
+    if len(codes) < 4:
+        return np.zeros(len(periods))
+
+    trigrams = codes[:-2] * 676 + codes[1:-1] * 26 + codes[2:]
+    order = np.argsort(trigrams, kind='stable')
+    repeated = trigrams[order][1:] == trigrams[order][:-1]
+    distances = (order[1:] - order[:-1])[repeated]
+    if not len(distances):
+        return np.zeros(len(periods))
+
+    hits = (distances[:, None] % periods[None, :] == 0).mean(axis=0)
+    chance = 1.0 / periods
+    return np.where(periods > 1, (hits - chance) / np.maximum(1 - chance, 1e-9), 0.0)
+
+
+def quadgram_ids(codes):
+    """Return the index (0 to 26^4 - 1) of every overlapping quadgram of a letter-code array"""
+    import numpy as np
+    codes = np.asarray(codes, dtype=np.int32)
+    return ((codes[:-3] * 26 + codes[1:-2]) * 26 + codes[2:-1]) * 26 + codes[3:]
+
+
+def build_quadgram_table(corpus, path=None):
+    """
+    Build a dense table of English quadgram log-probabilities
+    Args:
+        corpus: Training text (only its letters are used)
+        path: Optional .npy file to save the table to
+    Returns:
+        float32 array of 26^4 log10 probabilities, indexed by quadgram_ids;
+        quadgrams missing from the corpus get a small floor probability
+    """
+    import numpy as np
+    counts = np.bincount(quadgram_ids(letter_codes(corpus)), minlength=26 ** 4)
+    total = counts.sum()
+    if not total:
+        raise ValueError("Corpus must contain at least four letters")
+    
+    table = np.full(26 ** 4, math.log10(0.01 / total), dtype=np.float32)
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    
+    if path:
+        # Write to a temporary file first so readers never see a partial table
+        temp_path = f"{path}.{os.getpid()}.tmp.npy"
+        np.save(temp_path, table)
+        os.replace(temp_path, path)
+    return table
+
+
+def default_quadgram_path():
+    """
+    Where the default quadgram table is cached (never inside the package)
+    %LOCALAPPDATA%\\cryptotool on Windows, $XDG_CACHE_HOME/cryptotool
+    (~/.cache/cryptotool) elsewhere. The file name carries a hash of the
+    bundled sample, so a changed sample gets a fresh table.
+    """
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    with open(ENGLISH_SAMPLE, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    return os.path.join(base, 'cryptotool', f'quadgrams-{digest}.npy')
+
+
+@lru_cache(maxsize=8)
+def load_quadgram_table(path=None):
+    """
+    Load a quadgram table memory-mapped from disk (read-only)
+    Without a path the default table is used: it is built from the small
+    bundled sample the first time it is needed and cached under
+    default_quadgram_path(). Most of its cells are the floor value, so for
+    real cracking pass a table trained on a large corpus instead, e.g.
+    build_quadgram_table(corpus, 'english.npy') once, then path='english.npy'.
+    Args:
+        path: .npy file written by build_quadgram_table
+    Returns:
+        Array of 26^4 log10 probabilities
+    """
+    import numpy as np
+    if path is None:
+        path = default_quadgram_path()
+        if not os.path.exists(path):
+            with open(ENGLISH_SAMPLE, 'r', encoding='utf-8') as f:
+                corpus = f.read()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                build_quadgram_table(corpus, path)
+            except OSError:
+                # No writable cache directory: keep the table in memory instead
+                table = build_quadgram_table(corpus)
+                table.flags.writeable = False
+                return table
+    return np.load(path, mmap_mode='r')
+
+
+@lru_cache(maxsize=1)
+def load_bigram_table():
+    """
+    English bigram log10 probabilities from the bundled sample, as a (26, 26) array
+    Small enough to build in memory on every first use.
+    """
+    import numpy as np
+    with open(ENGLISH_SAMPLE, 'r', encoding='utf-8') as f:
+        codes = letter_codes(f.read()).astype(np.int64)
+    counts = np.bincount(codes[:-1] * 26 + codes[1:], minlength=26 * 26)
+    total = counts.sum()
+    table = np.full(26 * 26, math.log10(0.01 / total))
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    table = table.reshape(26, 26)
+    table.flags.writeable = False
+    return table
+
+
+def quadgram_fitness(text, table=None):
+    """
+    Mean log10 probability per quadgram of text (higher is more English)
+    Args:
+        text: Text to score (only its letters are used)
+        table: Quadgram table (defaults to load_quadgram_table())
+    """
+    if table is None:
+        table = load_quadgram_table()
+    ids = quadgram_ids(letter_codes(text))
+    if not len(ids):
+        raise ValueError("Text must contain at least four letters")
+    return float(table[ids].mean())
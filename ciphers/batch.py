@@ -0,0 +1,127 @@
+"""
+Batch Encryption
+Fans independent records out to a process pool, compiling the key once per worker
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from . import registry
+from .parallel import resolve_workers
+
+# Records shipped to a worker per task
+CHUNK_SIZE = 1000
+
+# Per-process state set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(cipher, key, options):
+    """
+    Compile the key once in each worker process
+    The Cipher instance itself is shipped rather than its name, so ciphers
+    registered at runtime also work when workers are spawned (a fresh
+    interpreter only has the built-in registry).
+    """
+    _worker['cipher'] = cipher
+    _worker['key'] = cipher.compile_key(key)
+    _worker['options'] = options
+
+
+def _process_chunk(decrypting, records):
+    """Encrypt or decrypt one chunk of records inside a worker"""
+    cipher = _worker['cipher']
+    process = cipher.decrypt_many if decrypting else cipher.encrypt_many
+    return process(records, _worker['key'], **_worker['options'])
+
+
+def _chunks(records, chunk_size):
+    """Split any iterable into lists of at most chunk_size records"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_process(decrypting, cipher, records, key, workers, chunk_size, options):
+    """Validate the arguments now, so errors surface at the call, then return the generator"""
+    if isinstance(cipher, str):
+        cipher = registry.get(cipher)
+    workers = resolve_workers(workers)
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    compiled = cipher.compile_key(key)  # An invalid key fails here too
+    return _generate(decrypting, cipher, records, key, compiled, workers, chunk_size,
+                     options)
+
+
+def _generate(decrypting, cipher, records, key, compiled, workers, chunk_size, options):
+    """Yield the processed records chunk by chunk, in input order"""
+    # A single worker runs in-process, still compiling the key only once
+    if workers == 1:
+        process = cipher.decrypt_many if decrypting else cipher.encrypt_many
+        for chunk in _chunks(records, chunk_size):
+            yield from process(chunk, compiled, **options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cipher, key, options)) as pool:
+        # Keep a bounded number of chunks in flight so unbounded inputs stream
+        pending = deque()
+        for chunk in _chunks(records, chunk_size):
+            pending.append(pool.submit(_process_chunk, decrypting, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def iter_encrypt(cipher, records, key, workers=None, chunk_size=CHUNK_SIZE, **options):
+    """
+    Lazily encrypt a (possibly unbounded) iterable of records in parallel
+    Args:
+        cipher: Registered cipher name (e.g. 'vigenere') or Cipher instance
+        records: Iterable of plain texts
+        key: Encryption key, compiled once per worker process
+        workers: Number of processes (defaults to one per CPU core)
+        chunk_size: Records sent to a worker per task
+        **options: Extra cipher options (e.g. mode/fmt for OTP)
+    Yields:
+        Encrypted records, in input order
+    """
+    return _iter_process(False, cipher, records, key, workers, chunk_size, options)
+
+
+def iter_decrypt(cipher, records, key, workers=None, chunk_size=CHUNK_SIZE, **options):
+    """
+    Lazily decrypt a (possibly unbounded) iterable of records in parallel
+    Args:
+        cipher: Registered cipher name (e.g. 'vigenere') or Cipher instance
+        records: Iterable of cipher texts
+        key: Decryption key, compiled once per worker process
+        workers: Number of processes (defaults to one per CPU core)
+        chunk_size: Records sent to a worker per task
+        **options: Extra cipher options (e.g. mode/fmt for OTP)
+    Yields:
+        Decrypted records, in input order
+    """
+    return _iter_process(True, cipher, records, key, workers, chunk_size, options)
+
+
+def encrypt_many(cipher, records, key, workers=None, chunk_size=CHUNK_SIZE, **options):
+    """
+    Encrypt many independent records on a process pool
+    Returns:
+        List of encrypted records, in input order (see iter_encrypt for arguments)
+    """
+    return list(iter_encrypt(cipher, records, key, workers, chunk_size, **options))
+
+
+def decrypt_many(cipher, records, key, workers=None, chunk_size=CHUNK_SIZE, **options):
+    """
+    Decrypt many independent records on a process pool
+    Returns:
+        List of decrypted records, in input order (see iter_decrypt for arguments)
+    """
+    return list(iter_decrypt(cipher, records, key, workers, chunk_size, **options))
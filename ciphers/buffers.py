@@ -0,0 +1,89 @@
+"""
+Buffer Helpers
+Shared handling of bytes-like inputs and caller-provided output buffers
+"""
+
+
+def as_bytes_view(data):
+    """Return a flat unsigned-byte memoryview over any bytes-like object"""
+    view = memoryview(data)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    return view
+
+
+def prepare_output(out, size):
+    """
+    Get a writable buffer with room for size bytes
+    Args:
+        out: Caller-provided writable buffer, or None to allocate one
+        size: Number of bytes that will be written
+    Returns:
+        Tuple (buffer, view) where view covers exactly the first size bytes
+    """
+    if out is None:
+        buffer = bytearray(size)
+        return buffer, memoryview(buffer)
+
+    view = as_bytes_view(out)
+    if view.readonly:
+        raise ValueError("Output buffer must be writable")
+    if len(view) < size:
+        raise ValueError(f"Output buffer too small: need {size} bytes, got {len(view)}")
+    return out, view[:size]
+
+
+def finish_output(out, buffer, view, length):
+    """
+    Return the first length bytes of a buffer filled by prepare_output
+    Freshly allocated buffers are trimmed in place and returned as a
+    bytearray, caller buffers are returned as a memoryview over out.
+    """
+    if out is not None:
+        return view[:length]
+    view.release()
+    del buffer[length:]
+    return buffer
+
+
+def unpadded_length(view, block_size):
+    """Validate PKCS#7 padding and return the length without it"""
+    if not len(view) or len(view) % block_size:
+        raise ValueError("Padding is incorrect.")
+    pad_len = view[-1]
+    if not 1 <= pad_len <= block_size or view[-pad_len:] != bytes([pad_len]) * pad_len:
+        raise ValueError("PKCS#7 padding is incorrect.")
+    return len(view) - pad_len
+
+
+def _xor_numpy(np, a, b, view):
+    np.bitwise_xor(np.frombuffer(a, dtype=np.uint8), np.frombuffer(b, dtype=np.uint8),
+                   out=np.frombuffer(view, dtype=np.uint8))
+
+
+def xor_bytes(a, b, out=None):
+    """
+    XOR two equal-length bytes-like buffers in bulk
+    Args:
+        a: bytes, bytearray or memoryview
+        b: bytes, bytearray or memoryview of the same length
+        out: Optional writable buffer of at least len(a) bytes (may alias a or b)
+    Returns:
+        a XOR b (bytearray, or a memoryview over out)
+    """
+    a = as_bytes_view(a)
+    b = as_bytes_view(b)
+    if len(a) != len(b):
+        raise ValueError(f"Buffers must have equal length ({len(a)} != {len(b)} bytes)")
+
+    buffer, view = prepare_output(out, len(a))
+    try:
+        import numpy as np
+    except ImportError:
+        # Without NumPy a single big-integer XOR still avoids a per-byte loop
+        result = int.from_bytes(a, 'little') ^ int.from_bytes(b, 'little')
+        view[:] = result.to_bytes(len(a), 'little')
+    else:
+        _xor_numpy(np, a, b, view)
+
+    return finish_output(out, buffer, view, len(a))
@@ -2,33 +2,60 @@
 Caesar Cipher Implementation
 Shifts each letter by a fixed number of positions in the alphabet
 """
+import string
+from functools import lru_cache
+from .analysis import Candidate, chi_squared_shifts, letter_counts, letter_counts_many
+
+
+def _parse_shift(key):
+    """Parse the key into a shift value"""
+    try:
+        return int(key)
+    except ValueError:
+        raise ValueError("Key must be a number for Caesar cipher")
+
+
+def compile_key(key):
+    """
+    Parse the key once into its shift
+    Args:
+        key: Shift value (should be a number)
+    Returns:
+        Shift as an int in the range 0-25
+    """
+    return _parse_shift(key) % 26
+
+
+@lru_cache(maxsize=None)
+def _translation_tables(shift):
+    """
+    Build the str and bytes translation tables for a shift
+    Only 26 distinct shifts exist, so every table is built once and cached.
+    """
+    shift %= 26
+    upper = string.ascii_uppercase
+    shifted = upper[shift:] + upper[:shift]
+    source = upper + upper.lower()
+    target = shifted + shifted.lower()
+    return (str.maketrans(source, target),
+            bytes.maketrans(source.encode('ascii'), target.encode('ascii')))
+
 
 def encrypt(text, key):
     """
     Encrypt text using Caesar cipher
+    Only A-Z and a-z are shifted; every other character, accented letters
+    included, is kept as is (the same as encrypt_bytes on UTF-8 data).
     Args:
         text: Plain text to encrypt
         key: Shift value (should be a number)
     Returns:
         Encrypted text
     """
-    try:
-        shift = int(key)
-    except ValueError:
-        raise ValueError("Key must be a number for Caesar cipher")
+    shift = _parse_shift(key)
     
-    result = []
-    for char in text:
-        if char.isalpha():
-            # Determine if uppercase or lowercase
-            ascii_offset = 65 if char.isupper() else 97
-            # Shift character
-            shifted = (ord(char) - ascii_offset + shift) % 26
-            result.append(chr(shifted + ascii_offset))
-        else:
-            result.append(char)
-    
-    return ''.join(result)
+    # A precomputed translation table shifts the ASCII letters only
+    return text.translate(_translation_tables(shift % 26)[0])
 
 
 def decrypt(text, key):
@@ -40,10 +67,72 @@ def decrypt(text, key):
     Returns:
         Decrypted text
     """
-    try:
-        shift = int(key)
-    except ValueError:
-        raise ValueError("Key must be a number for Caesar cipher")
+    shift = _parse_shift(key)
     
     # Decryption is just encryption with negative shift
     return encrypt(text, -shift)
+
+
+def encrypt_bytes(data, key):
+    """
+    Encrypt an ASCII byte buffer using Caesar cipher
+    Args:
+        data: bytes, bytearray or memoryview (only A-Z and a-z are shifted)
+        key: Shift value (should be a number)
+    Returns:
+        Encrypted bytes
+    """
+    shift = _parse_shift(key)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return data.translate(_translation_tables(shift % 26)[1])
+
+
+def decrypt_bytes(data, key):
+    """
+    Decrypt an ASCII byte buffer using Caesar cipher
+    Args:
+        data: bytes, bytearray or memoryview (only A-Z and a-z are shifted)
+        key: Shift value (should be a number)
+    Returns:
+        Decrypted bytes
+    """
+    return encrypt_bytes(data, -_parse_shift(key))
+
+
+def _ranked_candidates(text, scores, top):
+    """Turn the 26 shift scores of one text into ranked, decrypted candidates"""
+    order = scores.argsort(kind='stable')[:top]
+    return [Candidate(int(shift), float(scores[shift]), decrypt(text, int(shift)))
+            for shift in order]
+
+
+def crack(ciphertext, top=None):
+    """
+    Recover the shift of a Caesar ciphertext by trying all 26 shifts
+    The letter histogram is counted once and every shift is scored with a
+    chi-squared test against English; only the returned candidates are decrypted.
+    Args:
+        ciphertext: Cipher text with an unknown shift
+        top: Number of candidates to return (default: all 26)
+    Returns:
+        List of Candidate(key=shift, score, plaintext), best first
+    """
+    scores = chi_squared_shifts(letter_counts(ciphertext))
+    return _ranked_candidates(ciphertext, scores, top)
+
+
+def crack_many(ciphertexts, top=1):
+    """
+    Crack a whole corpus of independent Caesar ciphertexts in one batch
+    Args:
+        ciphertexts: Sequence of cipher texts (each may use a different shift)
+        top: Number of candidates returned per text
+    Returns:
+        List with one ranked candidate list per cipher text
+    """
+    ciphertexts = list(ciphertexts)
+    if not ciphertexts:
+        return []
+    scores = chi_squared_shifts(letter_counts_many(ciphertexts))
+    return [_ranked_candidates(text, row, top) for text, row in zip(ciphertexts, scores)]
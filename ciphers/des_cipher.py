@@ -2,45 +2,143 @@
 DES Cipher Implementation
 Uses PyCryptodome for DES encryption
 """
-from Crypto.Cipher import DES
-from Crypto.Util.Padding import pad, unpad
 import binascii
+from .buffers import as_bytes_view, prepare_output, finish_output, unpadded_length
+from .keycache import KeyCache
+from .parallel import resolve_workers, split_segments, run_segments
 
-def encrypt(text, key):
+# Block size in bytes (PyCryptodome is imported lazily, see ciphers/__init__.py)
+BLOCK_SIZE = 8
+
+
+def _prepare_key(key):
+    """Parse a hexadecimal key string into the 8 bytes required by DES"""
+    # Remove any spaces from the key
+    key = key.replace(' ', '').upper()
+    
+    # Check if key is valid hex
+    try:
+        key_bytes = binascii.unhexlify(key)
+    except (binascii.Error, ValueError):
+        raise ValueError("Key must be a valid hexadecimal string (e.g., '0123456789ABCDEF')")
+    
+    # Ensure key is exactly 8 bytes
+    if len(key_bytes) < 8:
+        # Pad with zeros
+        key_bytes = key_bytes + b'\x00' * (8 - len(key_bytes))
+    elif len(key_bytes) > 8:
+        # Truncate to 8 bytes
+        key_bytes = key_bytes[:8]
+    
+    return key_bytes
+
+
+def _create_cipher(key):
+    """Build the ECB cipher for a key (ECB keeps no per-message state)"""
+    from Crypto.Cipher import DES
+    return DES.new(_prepare_key(key), DES.MODE_ECB)
+
+
+# Ready-to-use ECB ciphers for recently used keys (see key_cache.info())
+key_cache = KeyCache(_create_cipher)
+
+
+def encrypted_length(length):
+    """Return the size of encrypt_bytes output (padded data) for a plain length"""
+    return (length // BLOCK_SIZE + 1) * BLOCK_SIZE
+
+
+def _ecb_decrypt(cipher, ciphertext, output, workers=1):
     """
-    Encrypt text using DES
+    Decrypt ECB ciphertext into output (without unpadding), in parallel when asked to
+    ECB blocks are independent, so segments need no chaining state.
+    """
+    if len(ciphertext) % BLOCK_SIZE:
+        raise ValueError("Ciphertext length is not a multiple of the block size")
+    
+    workers = resolve_workers(workers)
+    segments = split_segments(len(ciphertext), BLOCK_SIZE, workers)
+    
+    def decrypt_segment(start, end):
+        cipher.decrypt(ciphertext[start:end], output=output[start:end])
+    
+    run_segments(decrypt_segment, segments, workers)
+
+
+def encrypt_bytes(data, key, out=None):
+    """
+    Encrypt raw bytes using DES
     Args:
-        text: Plain text to encrypt
+        data: bytes, bytearray or memoryview to encrypt
         key: 16-character hexadecimal string (e.g., '0123456789ABCDEF')
+        out: Optional writable buffer of at least encrypted_length(len(data)) bytes
     Returns:
-        Encrypted text in hexadecimal
+        Ciphertext (bytearray, or a memoryview over out)
     """
+    from Crypto.Util.Padding import pad
     try:
         # Prepare key (DES requires 8 bytes = 16 hex characters)
-        # Remove any spaces from the key
-        key = key.replace(' ', '').upper()
+        cipher = key_cache.get(key)
         
-        # Check if key is valid hex
-        try:
-            key_bytes = binascii.unhexlify(key)
-        except (binascii.Error, ValueError):
-            raise ValueError("Key must be a valid hexadecimal string (e.g., '0123456789ABCDEF')")
+        data = as_bytes_view(data)
+        size = encrypted_length(len(data))
+        buffer, view = prepare_output(out, size)
         
-        # Ensure key is exactly 8 bytes
-        if len(key_bytes) < 8:
-            # Pad with zeros
-            key_bytes = key_bytes + b'\x00' * (8 - len(key_bytes))
-        elif len(key_bytes) > 8:
-            # Truncate to 8 bytes
-            key_bytes = key_bytes[:8]
+        # Whole blocks are encrypted in place, only the tail is copied for padding
+        full = len(data) - len(data) % BLOCK_SIZE
+        if full:
+            cipher.encrypt(data[:full], output=view[:full])
+        cipher.encrypt(pad(data[full:].tobytes(), BLOCK_SIZE), output=view[full:])
         
-        # Create cipher
-        cipher = DES.new(key_bytes, DES.MODE_ECB)
+        return finish_output(out, buffer, view, size)
+    
+    except ValueError as ve:
+        raise ve
+    except Exception as e:
+        raise ValueError(f"DES encryption error: {str(e)}")
+
+
+def decrypt_bytes(data, key, out=None, workers=1):
+    """
+    Decrypt raw bytes produced by encrypt_bytes
+    Args:
+        data: Ciphertext (bytes, bytearray or memoryview)
+        key: 16-character hexadecimal string used for encryption
+        out: Optional writable buffer of at least len(data) bytes
+        workers: Number of threads for large ciphertexts (None for one per core)
+    Returns:
+        Plain bytes (bytearray, or a memoryview over out)
+    """
+    try:
+        # Prepare key
+        cipher = key_cache.get(key)
+        
+        data = as_bytes_view(data)
+        buffer, view = prepare_output(out, len(data))
         
-        # Pad and encrypt
-        text_bytes = text.encode('utf-8')
-        padded_text = pad(text_bytes, DES.block_size)
-        encrypted = cipher.encrypt(padded_text)
+        # Decrypt (only the final block carries padding)
+        _ecb_decrypt(cipher, data, view, workers)
+        length = unpadded_length(view, BLOCK_SIZE)
+        
+        return finish_output(out, buffer, view, length)
+    
+    except ValueError as ve:
+        raise ve
+    except Exception as e:
+        raise ValueError(f"DES decryption error: {str(e)}")
+
+
+def encrypt(text, key):
+    """
+    Encrypt text using DES
+    Args:
+        text: Plain text to encrypt
+        key: 16-character hexadecimal string (e.g., '0123456789ABCDEF')
+    Returns:
+        Encrypted text in hexadecimal
+    """
+    try:
+        encrypted = encrypt_bytes(text.encode('utf-8'), key)
         
         # Return as hex string
         return binascii.hexlify(encrypted).decode('utf-8')
@@ -51,40 +149,21 @@ def encrypt(text, key):
         raise ValueError(f"DES encryption error: {str(e)}")
 
 
-def decrypt(text, key):
+def decrypt(text, key, workers=1):
     """
     Decrypt text using DES
     Args:
         text: Cipher text in hexadecimal
         key: 16-character hexadecimal string used for encryption
+        workers: Number of threads for large ciphertexts (None for one per core)
     Returns:
         Decrypted text
     """
     try:
-        # Prepare key
-        key = key.replace(' ', '').upper()
-        
-        # Check if key is valid hex
-        try:
-            key_bytes = binascii.unhexlify(key)
-        except (binascii.Error, ValueError):
-            raise ValueError("Key must be a valid hexadecimal string (e.g., '0123456789ABCDEF')")
-        
-        # Ensure key is exactly 8 bytes
-        if len(key_bytes) < 8:
-            key_bytes = key_bytes + b'\x00' * (8 - len(key_bytes))
-        elif len(key_bytes) > 8:
-            key_bytes = key_bytes[:8]
-        
-        # Create cipher
-        cipher = DES.new(key_bytes, DES.MODE_ECB)
-        
-        # Decrypt
         encrypted_bytes = binascii.unhexlify(text)
-        decrypted = cipher.decrypt(encrypted_bytes)
-        unpadded = unpad(decrypted, DES.block_size)
+        decrypted = decrypt_bytes(encrypted_bytes, key, workers=workers)
         
-        return unpadded.decode('utf-8')
+        return decrypted.decode('utf-8')
     
     except ValueError as ve:
         raise ve
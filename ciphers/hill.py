@@ -1,46 +1,86 @@
 """
 Hill Cipher Implementation
-Matrix-based encryption using linear algebra
+Matrix-based encryption using linear algebra (NumPy, imported on first use)
 """
-import numpy as np
-import string
+import math
+from functools import lru_cache
+from .analysis import Candidate, letter_codes, load_bigram_table
+from .keycache import FrozenKey
+
 
 def _text_to_numbers(text):
     """Convert text to numbers (A=0, B=1, ...)"""
-    text = text.upper()
-    return [ord(c) - 65 for c in text if c in string.ascii_uppercase]
+    import numpy as np
+    data = np.frombuffer(text.upper().encode('ascii', 'ignore'), dtype=np.uint8)
+    letters = data[(data >= 65) & (data <= 90)]
+    return letters.astype(np.int64) - 65
 
 
 def _numbers_to_text(numbers):
     """Convert numbers to text"""
-    return ''.join([chr(n % 26 + 65) for n in numbers])
+    import numpy as np
+    codes = (np.asarray(numbers) % 26 + 65).astype(np.uint8)
+    return codes.tobytes().decode('ascii')
 
 
 def _mod_inverse(a, m):
-    """Find modular inverse of a under modulo m"""
-    for i in range(1, m):
-        if (a * i) % m == 1:
-            return i
-    return None
+    """Find modular inverse of a under modulo m (extended Euclid)"""
+    try:
+        return pow(int(a), -1, m)
+    except ValueError:
+        return None
 
 
 def _matrix_mod_inverse(matrix, modulus):
-    """Find modular inverse of matrix"""
-    det = int(round(np.linalg.det(matrix)))
-    det = det % modulus
+    """
+    Find modular inverse of matrix using exact integer arithmetic
+    Fraction-free Gauss-Jordan elimination on [A | I] ends with det * I on
+    the left and det * A^-1 (the adjugate, up to row swaps) on the right.
+    Every intermediate value is an exact integer, so no rounding is involved.
+    """
+    import numpy as np
+    size = len(matrix)
+    rows = [[int(value) % modulus for value in row] + [int(i == r) for i in range(size)]
+            for r, row in enumerate(np.asarray(matrix).tolist())]
     
-    det_inv = _mod_inverse(det, modulus)
-    if det_inv is None:
-        raise ValueError("Matrix is not invertible under mod 26")
+    previous = 1
+    for k in range(size):
+        # Any non-zero pivot keeps the elimination exact
+        pivot_row = next((r for r in range(k, size) if rows[r][k]), None)
+        if pivot_row is None:
+            raise ValueError(f"Matrix is not invertible under mod {modulus}")
+        rows[k], rows[pivot_row] = rows[pivot_row], rows[k]
+        
+        pivot_values = rows[k]
+        pivot = pivot_values[k]
+        for i in range(size):
+            if i != k:
+                factor = rows[i][k]
+                rows[i] = [(pivot * a - factor * b) // previous
+                           for a, b in zip(rows[i], pivot_values)]
+        previous = pivot
     
-    matrix_inv = np.round(det * np.linalg.inv(matrix)).astype(int)
-    matrix_inv = (matrix_inv * det_inv) % modulus
+    # The final pivot is the determinant (row swaps are already folded in)
+    det_inv = _mod_inverse(previous, modulus)
+    if det_inv is None:
+        raise ValueError(f"Matrix is not invertible under mod {modulus}")
     
+    matrix_inv = np.array([row[size:] for row in rows], dtype=object)
+    return ((matrix_inv * det_inv) % modulus).astype(np.int64)
+
+
+@lru_cache(maxsize=128)
+def _cached_matrix_inverse(values, size):
+    """Inverse mod 26 of a key matrix, computed once per key"""
+    import numpy as np
+    matrix_inv = _matrix_mod_inverse(np.array(values).reshape(size, size), 26)
+    matrix_inv.flags.writeable = False
     return matrix_inv
 
 
 def _parse_key_matrix(key, size):
     """Parse key string into matrix"""
+    import numpy as np
     try:
         # Try to parse as comma/space separated numbers
         numbers = []
@@ -56,41 +96,105 @@ def _parse_key_matrix(key, size):
         raise ValueError(f"Invalid key format: {str(e)}")
 
 
+def _key_size(key):
+    """Determine the n of an n x n key matrix from the number of key values"""
+    key_parts = len(key.replace(',', ' ').split())
+    size = math.isqrt(key_parts)
+    if size < 2 or size * size != key_parts:
+        raise ValueError("Key must contain a square number of values "
+                         "(e.g. 4 numbers for 2x2, 9 numbers for 3x3)")
+    return size
+
+
+def _apply_matrix(matrix, numbers):
+    """Multiply every block of numbers by matrix in a single operation"""
+    size = matrix.shape[0]
+    blocks = numbers.reshape(-1, size)
+    # Row-vector form of matrix @ block for all blocks at once
+    return (blocks @ matrix.T) % 26
+
+
+class HillKey(FrozenKey):
+    """
+    Parsed Hill key matrix; its inverse is computed on first decryption
+    Args:
+        key: Matrix key as n*n numbers, e.g. "a,b,c,d" for 2x2
+    """
+    __slots__ = ('size', 'values', 'matrix')
+
+    def __init__(self, key):
+        self.size = _key_size(key)
+        matrix = _parse_key_matrix(key, self.size) % 26
+        matrix.flags.writeable = False
+        self.matrix = matrix
+        self.values = tuple(int(value) for value in matrix.flat)
+
+    def __repr__(self):
+        return f"HillKey({' '.join(map(str, self.values))!r})"
+
+    @property
+    def inverse(self):
+        """Inverse key matrix mod 26 (cached per key)"""
+        try:
+            return _cached_matrix_inverse(self.values, self.size)
+        except ValueError as e:
+            raise ValueError(f"Cannot decrypt: {str(e)}")
+
+    def encrypt(self, text):
+        """Encrypt text with this key"""
+        import numpy as np
+        # Convert text to numbers
+        numbers = _text_to_numbers(text)
+        
+        # Pad if necessary
+        padding = -len(numbers) % self.size
+        if padding:
+            numbers = np.concatenate([numbers, np.full(padding, 23)])  # Pad with 'X'
+        
+        # Encrypt all blocks at once
+        return _numbers_to_text(_apply_matrix(self.matrix, numbers))
+
+    def decrypt(self, text):
+        """Decrypt text with this key"""
+        key_matrix_inv = self.inverse
+        
+        # Convert text to numbers
+        numbers = _text_to_numbers(text)
+        if len(numbers) % self.size:
+            raise ValueError(f"Cipher text length must be a multiple of {self.size} letters")
+        
+        # Decrypt all blocks at once
+        return _numbers_to_text(_apply_matrix(key_matrix_inv, numbers))
+
+
+@lru_cache(maxsize=128)
+def _compile_cached(key):
+    return HillKey(key)
+
+
+def compile_key(key):
+    """
+    Parse a Hill key once and return a reusable HillKey
+    Args:
+        key: Matrix key string (or an existing HillKey)
+    Returns:
+        HillKey
+    """
+    if isinstance(key, HillKey):
+        return key
+    return _compile_cached(key)
+
+
 def encrypt(text, key):
     """
     Encrypt text using Hill cipher
     Args:
         text: Plain text to encrypt
-        key: Matrix key as string "a,b,c,d" for 2x2 or "a,b,c,d,e,f,g,h,i" for 3x3
+        key: Matrix key as n*n numbers, e.g. "a,b,c,d" for 2x2 or "a,b,c,d,e,f,g,h,i" for 3x3
     Returns:
         Encrypted text
     """
-    # Determine matrix size (default to 2x2)
-    key_parts = len(key.replace(',', ' ').split())
-    if key_parts == 4:
-        size = 2
-    elif key_parts == 9:
-        size = 3
-    else:
-        raise ValueError("Key must be for 2x2 (4 numbers) or 3x3 (9 numbers) matrix")
-    
-    key_matrix = _parse_key_matrix(key, size)
-    
-    # Convert text to numbers
-    numbers = _text_to_numbers(text)
-    
-    # Pad if necessary
-    while len(numbers) % size != 0:
-        numbers.append(23)  # Pad with 'X'
-    
-    # Encrypt in blocks
-    result = []
-    for i in range(0, len(numbers), size):
-        block = np.array(numbers[i:i+size])
-        encrypted_block = np.dot(key_matrix, block) % 26
-        result.extend(encrypted_block)
-    
-    return _numbers_to_text(result)
+    return compile_key(key).encrypt(text)
 
 
 def decrypt(text, key):
@@ -98,35 +202,149 @@ def decrypt(text, key):
     Decrypt text using Hill cipher
     Args:
         text: Cipher text to decrypt
-        key: Matrix key as string "a,b,c,d" for 2x2 or "a,b,c,d,e,f,g,h,i" for 3x3
+        key: Matrix key as n*n numbers, e.g. "a,b,c,d" for 2x2 or "a,b,c,d,e,f,g,h,i" for 3x3
     Returns:
         Decrypted text
     """
-    # Determine matrix size
-    key_parts = len(key.replace(',', ' ').split())
-    if key_parts == 4:
-        size = 2
-    elif key_parts == 9:
-        size = 3
-    else:
-        raise ValueError("Key must be for 2x2 (4 numbers) or 3x3 (9 numbers) matrix")
+    return compile_key(key).decrypt(text)
+
+
+def _independent_rows(blocks, modulus, size):
+    """
+    Pick the first size blocks that are linearly independent mod a prime
+    Each block is reduced against the rows kept so far (incremental Gaussian
+    elimination) and kept only if it adds rank, so one pass over the text
+    finds a solvable subsystem whenever one exists.
+    Returns:
+        List of block indices, or None when the blocks do not have full rank
+    """
+    basis = []  # (pivot column, row reduced against the earlier rows, pivot = 1)
+    chosen = []
+    for index, block in enumerate(blocks):
+        row = [int(value) % modulus for value in block]
+        for pivot, reduced in basis:
+            factor = row[pivot]
+            if factor:
+                row = [(a - factor * b) % modulus for a, b in zip(row, reduced)]
+        pivot = next((column for column, value in enumerate(row) if value), None)
+        if pivot is None:
+            continue
+        scale = pow(row[pivot], -1, modulus)
+        basis.append((pivot, [value * scale % modulus for value in row]))
+        chosen.append(index)
+        if len(chosen) == size:
+            return chosen
+    return None
+
+
+def _solve_mod(plain_blocks, cipher_blocks, modulus):
+    """
+    Solve C = P @ K.T for K mod a prime modulus from n independent plaintext blocks
+    Returns:
+        Key matrix mod modulus, or None when the plaintext blocks do not have full rank
+    """
+    rows = _independent_rows(plain_blocks, modulus, plain_blocks.shape[1])
+    if rows is None:
+        return None
+    plain_inv = _matrix_mod_inverse(plain_blocks[rows], modulus)
+    return (plain_inv @ cipher_blocks[rows] % modulus).T
+
+
+def recover_key(plaintext, ciphertext, size=2):
+    """
+    Recover a Hill key from aligned known plaintext and its ciphertext
+    26 is not prime, so the key is solved mod 2 and mod 13 separately and
+    combined with the Chinese remainder theorem. For each prime, n plaintext
+    blocks independent mod p form an invertible matrix P, and K.T = P^-1 C.
+    The blocks are picked greedily in one pass, so any amount of text works.
+    Args:
+        plaintext: Known plain text (only letters count, aligned with the ciphertext)
+        ciphertext: Matching cipher text
+        size: n of the n x n key matrix
+    Returns:
+        Key string ("a,b,c,d" for 2x2) that reproduces every known block
+    """
+    import numpy as np
+    plain, cipher = letter_codes(plaintext), letter_codes(ciphertext)
+    usable = min(len(plain), len(cipher)) // size * size
+    if usable < size * size:
+        raise ValueError(f"Need at least {size * size} aligned letters for a {size}x{size} key")
     
-    key_matrix = _parse_key_matrix(key, size)
+    plain_blocks = plain[:usable].astype(np.int64).reshape(-1, size)
+    cipher_blocks = cipher[:usable].astype(np.int64).reshape(-1, size)
     
-    # Calculate inverse matrix
-    try:
-        key_matrix_inv = _matrix_mod_inverse(key_matrix, 26)
-    except ValueError as e:
-        raise ValueError(f"Cannot decrypt: {str(e)}")
+    key_2 = _solve_mod(plain_blocks, cipher_blocks, 2)
+    key_13 = _solve_mod(plain_blocks, cipher_blocks, 13)
+    if key_2 is None or key_13 is None:
+        raise ValueError("Known plaintext does not determine the key; supply more text")
+    # x = key_2 (mod 2) and x = key_13 (mod 13)
+    key = (key_2 * 13 + key_13 * 14) % 26
+    
+    if not np.array_equal(_apply_matrix(key, plain_blocks.ravel()), cipher_blocks):
+        raise ValueError("Plaintext and ciphertext are not related by a single Hill key")
+    return ','.join(str(int(value)) for value in key.flat)
+
+
+def crack(ciphertext, top=3):
+    """
+    Ciphertext-only search over every 2x2 Hill key
+    All 26^4 decryption matrices are tried at once: each matrix row yields
+    one letter per block, so the 676 possible rows are applied to the
+    distinct blocks once and every pair of rows is scored with English
+    bigram log-probabilities weighted by block and block-pair counts.
+    Args:
+        ciphertext: Cipher text encrypted with a 2x2 key (even number of letters)
+        top: Number of candidates to return
+    Returns:
+        List of Candidate(key, score, plaintext), best (lowest mean -log10 per bigram) first
+    """
+    import numpy as np
+    codes = letter_codes(ciphertext).astype(np.int64)
+    if len(codes) % 2:
+        raise ValueError("Cipher text length must be a multiple of 2 letters")
+    if len(codes) < 4:
+        raise ValueError("Cipher text is too short to analyse")
+    bigrams = load_bigram_table()
+    
+    # Score each distinct block (at most 676) once, weighted by how often it
+    # occurs, so time and memory do not grow with the cipher text
+    blocks = codes.reshape(-1, 2)
+    unique, block_ids, counts = np.unique(blocks[:, 0] * 26 + blocks[:, 1],
+                                          return_inverse=True, return_counts=True)
+    distinct = len(unique)
+    # follows[p, q]: how often distinct block q comes right after distinct block p
+    follows = np.bincount(block_ids[:-1] * distinct + block_ids[1:],
+                          minlength=distinct * distinct).reshape(distinct, distinct)
+    
+    # letters[r, j]: the letter decryption row r = (a, b) gives for distinct block j
+    rows = np.stack(np.divmod(np.arange(676), 26), axis=1)
+    letters = rows @ np.stack(np.divmod(unique, 26)) % 26
+    # first[r0, (j, y)]: whether row r0 turns block j into letter y
+    first = np.eye(26, dtype=bool)[letters].reshape(676, -1)
     
-    # Convert text to numbers
-    numbers = _text_to_numbers(text)
+    # scores[r0, r1]: bigrams inside each block plus those across block boundaries.
+    # For 26 second rows r1 at a time, weight[r1, j, y] is the log-probability
+    # gained when the first letter of block j is y, so scores = first @ weight.T
+    scores = np.empty((676, 676))
+    for start in range(0, 676, 26):
+        second = letters[start:start + 26]
+        inside = bigrams.T[second] * counts[None, :, None]
+        preceding = bigrams[second].transpose(1, 0, 2).reshape(distinct, -1)
+        across = (follows.T @ preceding).reshape(distinct, 26, 26).transpose(1, 0, 2)
+        weight = (inside + across).reshape(26, -1)
+        for row in range(0, 676, 26):
+            scores[row:row + 26, start:start + 26] = first[row:row + 26] @ weight.T
     
-    # Decrypt in blocks
-    result = []
-    for i in range(0, len(numbers), size):
-        block = np.array(numbers[i:i+size])
-        decrypted_block = np.dot(key_matrix_inv, block) % 26
-        result.extend(decrypted_block)
+    # Only invertible decryption matrices correspond to a key
+    det = (rows[:, None, 0] * rows[None, :, 1] - rows[:, None, 1] * rows[None, :, 0]) % 26
+    scores[(det % 2 == 0) | (det % 13 == 0)] = -np.inf
     
-    return _numbers_to_text(result)
+    best = np.argsort(-scores, axis=None, kind='stable')[:top]
+    candidates = []
+    for index in best:
+        r0, r1 = divmod(int(index), 676)
+        decrypt_matrix = np.stack([rows[r0], rows[r1]])
+        key = ','.join(str(int(v)) for v in _matrix_mod_inverse(decrypt_matrix, 26).flat)
+        score = -float(scores[r0, r1]) / (len(codes) - 1)
+        candidates.append(Candidate(key, score, decrypt(ciphertext, key)))
+    return candidates
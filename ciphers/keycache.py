@@ -0,0 +1,93 @@
+"""
+Key Cache Implementation
+Bounded LRU cache for prepared key material, shared by the block ciphers,
+and the immutable base class of the compiled key objects
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class FrozenKey:
+    """
+    Base for compiled keys, which compile_key caches and shares between callers
+    Each attribute can be assigned once (in __init__) and never rebound or
+    deleted, so no caller can change a key other callers are using.
+    Subclasses declare __slots__ and keep their public attributes immutable
+    too (tuples, bytes, read-only arrays or MappingProxyType).
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class KeyCache:
+    """
+    Least-recently-used cache mapping key strings to prepared key material
+    Args:
+        factory: Function turning a key string into the value to cache
+        maxsize: Maximum number of keys kept before the oldest is evicted
+    """
+
+    def __init__(self, factory, maxsize=128):
+        self._factory = factory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.maxsize = self._check_size(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _check_size(maxsize):
+        maxsize = int(maxsize)
+        if maxsize < 0:
+            raise ValueError("Cache size cannot be negative")
+        return maxsize
+
+    def get(self, key):
+        """Return the prepared value for key, building it on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Build outside the lock; invalid keys raise and are never cached
+        value = self._factory(key)
+
+        with self._lock:
+            if self.maxsize:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._evict()
+        return value
+
+    def resize(self, maxsize):
+        """Change the maximum number of cached keys (0 disables caching)"""
+        with self._lock:
+            self.maxsize = self._check_size(maxsize)
+            self._evict()
+
+    def clear(self):
+        """Drop every cached key and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Return hit/miss statistics as a CacheInfo tuple"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def _evict(self):
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
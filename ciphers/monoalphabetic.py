@@ -2,7 +2,99 @@
 Monoalphabetic Substitution Cipher Implementation
 Maps each letter to another letter using a substitution key
 """
+import random
 import string
+from functools import lru_cache
+from types import MappingProxyType
+from .analysis import Candidate, letter_codes, load_quadgram_table, quadgram_ids
+from .keycache import FrozenKey
+from .parallel import resolve_workers
+
+# English letters from most to least frequent, used for the first starting key
+ENGLISH_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+# Per-process solver state set up once by _init_solver
+_solver = {}
+
+
+class MonoalphabeticKey(FrozenKey):
+    """
+    Validated substitution key holding precomputed translation tables
+    Validation and table construction happen once, so one key can be
+    reused across any number of messages.
+    Args:
+        key: 26-character substitution alphabet
+    """
+    __slots__ = ('key', '_encrypt_table', '_decrypt_table',
+                 '_encrypt_bytes_table', '_decrypt_bytes_table')
+
+    def __init__(self, key):
+        if len(key) != 26:
+            raise ValueError("Key must be exactly 26 characters (one for each letter)")
+        
+        alphabet = string.ascii_uppercase
+        key = key.upper()
+        
+        # Check if key contains all unique letters
+        if len(set(key)) != 26 or not all(c in alphabet for c in key):
+            raise ValueError("Key must contain all 26 unique letters")
+        
+        plain = alphabet + alphabet.lower()
+        cipher = key + key.lower()
+        
+        self.key = key
+        self._encrypt_table = MappingProxyType(str.maketrans(plain, cipher))
+        self._decrypt_table = MappingProxyType(str.maketrans(cipher, plain))
+        self._encrypt_bytes_table = bytes.maketrans(plain.encode('ascii'), cipher.encode('ascii'))
+        self._decrypt_bytes_table = bytes.maketrans(cipher.encode('ascii'), plain.encode('ascii'))
+
+    def __repr__(self):
+        return f"MonoalphabeticKey({self.key!r})"
+
+    def encrypt(self, text):
+        """Encrypt text with this key"""
+        return text.translate(self._encrypt_table)
+
+    def decrypt(self, text):
+        """Decrypt text with this key"""
+        return text.translate(self._decrypt_table)
+
+    def encrypt_bytes(self, data):
+        """Encrypt an ASCII byte buffer with this key"""
+        return bytes(data).translate(self._encrypt_bytes_table)
+
+    def decrypt_bytes(self, data):
+        """Decrypt an ASCII byte buffer with this key"""
+        return bytes(data).translate(self._decrypt_bytes_table)
+
+    def encrypt_many(self, texts):
+        """Encrypt every text of an iterable, returning a list"""
+        table = self._encrypt_table
+        return [text.translate(table) for text in texts]
+
+    def decrypt_many(self, texts):
+        """Decrypt every text of an iterable, returning a list"""
+        table = self._decrypt_table
+        return [text.translate(table) for text in texts]
+
+
+@lru_cache(maxsize=128)
+def _compile_cached(key):
+    return MonoalphabeticKey(key)
+
+
+def compile_key(key):
+    """
+    Validate a substitution key once and return a reusable MonoalphabeticKey
+    Args:
+        key: 26-character substitution alphabet (or an existing MonoalphabeticKey)
+    Returns:
+        MonoalphabeticKey
+    """
+    if isinstance(key, MonoalphabeticKey):
+        return key
+    return _compile_cached(key)
+
 
 def encrypt(text, key):
     """
@@ -13,21 +105,7 @@ def encrypt(text, key):
     Returns:
         Encrypted text
     """
-    if len(key) != 26:
-        raise ValueError("Key must be exactly 26 characters (one for each letter)")
-    
-    # Create translation table
-    alphabet = string.ascii_uppercase
-    key = key.upper()
-    
-    # Check if key contains all unique letters
-    if len(set(key)) != 26 or not all(c in alphabet for c in key):
-        raise ValueError("Key must contain all 26 unique letters")
-    
-    trans_table = str.maketrans(alphabet + alphabet.lower(), 
-                                key + key.lower())
-    
-    return text.translate(trans_table)
+    return compile_key(key).encrypt(text)
 
 
 def decrypt(text, key):
@@ -39,19 +117,171 @@ def decrypt(text, key):
     Returns:
         Decrypted text
     """
-    if len(key) != 26:
-        raise ValueError("Key must be exactly 26 characters (one for each letter)")
+    return compile_key(key).decrypt(text)
+
+
+def encrypt_bytes(data, key):
+    """
+    Encrypt an ASCII byte buffer using monoalphabetic substitution cipher
+    Args:
+        data: bytes, bytearray or memoryview (only A-Z and a-z are substituted)
+        key: 26-character substitution alphabet
+    Returns:
+        Encrypted bytes
+    """
+    return compile_key(key).encrypt_bytes(data)
+
+
+def decrypt_bytes(data, key):
+    """
+    Decrypt an ASCII byte buffer using monoalphabetic substitution cipher
+    Args:
+        data: bytes, bytearray or memoryview (only A-Z and a-z are substituted)
+        key: 26-character substitution alphabet
+    Returns:
+        Decrypted bytes
+    """
+    return compile_key(key).decrypt_bytes(data)
+
+
+def _init_solver(quads, counts, table_path):
+    """Share the ciphertext quadgrams and the (memory-mapped) table with a solver process"""
+    import numpy as np
+    _solver['quads'] = quads
+    _solver['counts'] = counts.astype(np.float64)
+    _solver['table'] = load_quadgram_table(table_path)
+    # contains[c] marks the distinct quadgrams holding cipher letter c
+    _solver['contains'] = np.stack([(quads == c).any(axis=1) for c in range(26)])
+
+
+def _starting_mapping(rng, restart, letter_counts):
+    """Cipher-to-plain mapping to climb from: frequency order first, then random"""
+    import numpy as np
+    if restart == 0:
+        mapping = np.empty(26, dtype=np.int64)
+        by_frequency = np.argsort(-letter_counts, kind='stable')
+        mapping[by_frequency] = [ord(c) - 65 for c in ENGLISH_ORDER]
+        return mapping
+    mapping = list(range(26))
+    rng.shuffle(mapping)
+    return np.array(mapping, dtype=np.int64)
+
+
+def _quad_ids(quads):
+    """Quadgram indices of an (n, 4) array of letter codes"""
+    return ((quads[:, 0] * 26 + quads[:, 1]) * 26 + quads[:, 2]) * 26 + quads[:, 3]
+
+
+def _climb(restart, seed, letter_counts):
+    """
+    One hill climb: swap two letters of the key and keep every improvement
+    Only the distinct quadgrams containing one of the swapped cipher letters
+    are re-scored, so each step costs a fraction of a full decryption.
+    Returns:
+        Tuple (total log10 fitness, cipher-to-plain mapping)
+    """
+    quads = _solver['quads']
+    counts = _solver['counts']
+    table = _solver['table']
+    contains = _solver['contains']
+    
+    rng = random.Random(seed)
+    mapping = _starting_mapping(rng, restart, letter_counts)
+    ids = _quad_ids(mapping[quads])
+    fitness = float(counts @ table[ids])
+    pairs = [(a, b) for a in range(26) for b in range(a + 1, 26)]
+    
+    improved = True
+    while improved:
+        improved = False
+        rng.shuffle(pairs)
+        for a, b in pairs:
+            affected = contains[a] | contains[b]
+            trial = mapping.copy()
+            trial[a], trial[b] = mapping[b], mapping[a]
+            new_ids = _quad_ids(trial[quads[affected]])
+            delta = float(counts[affected] @ (table[new_ids] - table[ids[affected]]))
+            if delta > 1e-9:
+                mapping = trial
+                ids[affected] = new_ids
+                fitness += delta
+                improved = True
+    return fitness, mapping
+
+
+def _mapping_to_key(mapping):
+    """Turn a cipher-to-plain mapping into a 26-letter substitution key"""
+    key = [''] * 26
+    for cipher_letter, plain_letter in enumerate(mapping):
+        key[plain_letter] = chr(65 + cipher_letter)
+    return ''.join(key)
+
+
+def crack(ciphertext, restarts=20, top=3, workers=None, threshold=None,
+          table=None, seed=None):
+    """
+    Recover a substitution key by randomized-restart hill climbing
+    Each restart swaps pairs of key letters while the quadgram fitness of the
+    decryption improves; restarts run on a process pool and stop early once
+    one reaches the threshold.
+    Args:
+        ciphertext: Cipher text (a few hundred letters or more works best)
+        restarts: Number of independent hill climbs
+        top: Number of distinct keys to return
+        workers: Number of processes (defaults to one per CPU core)
+        threshold: Stop once a key scores at or below this (mean -log10 per quadgram)
+        table: Quadgram table path from build_quadgram_table (the default,
+            built from the small bundled sample, is only good for demos)
+        seed: Seed for reproducible restarts
+    Returns:
+        List of Candidate(key, score, plaintext), best (lowest score) first
+    """
+    import numpy as np
+    codes = letter_codes(ciphertext)
+    if len(codes) < 4:
+        raise ValueError("Cipher text is too short to analyse")
+    if restarts < 1:
+        raise ValueError("Number of restarts must be at least 1")
+    
+    # Score distinct quadgrams once each, weighted by how often they occur
+    unique_ids, counts = np.unique(quadgram_ids(codes), return_counts=True)
+    quads = np.stack([unique_ids // 17576, unique_ids // 676 % 26,
+                      unique_ids // 26 % 26, unique_ids % 26], axis=1)
+    letter_counts = np.bincount(codes, minlength=26)
+    total = counts.sum()
     
-    # Create reverse translation table
-    alphabet = string.ascii_uppercase
-    key = key.upper()
+    load_quadgram_table(table)  # Build the default table once, before any fork
+    base_seed = random.randrange(2 ** 32) if seed is None else seed
+    jobs = [(restart, base_seed + restart, letter_counts) for restart in range(restarts)]
+    workers = min(resolve_workers(workers), restarts)
     
-    # Check if key contains all unique letters
-    if len(set(key)) != 26 or not all(c in alphabet for c in key):
-        raise ValueError("Key must contain all 26 unique letters")
+    results = []
+    def good_enough(result):
+        return threshold is not None and -result[0] / total <= threshold
     
-    # Reverse the mapping for decryption
-    trans_table = str.maketrans(key + key.lower(), 
-                                alphabet + alphabet.lower())
+    if workers == 1:
+        _init_solver(quads, counts, table)
+        for job in jobs:
+            results.append(_climb(*job))
+            if good_enough(results[-1]):
+                break
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_solver,
+                                 initargs=(quads, counts, table)) as pool:
+            futures = [pool.submit(_climb, *job) for job in jobs]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if good_enough(results[-1]):
+                    for pending in futures:
+                        pending.cancel()
+                    break
     
-    return text.translate(trans_table)
+    # Keys differing only in letters absent from the text decrypt alike
+    candidates = {}
+    for fitness, mapping in sorted(results, key=lambda result: -result[0]):
+        key = _mapping_to_key(mapping)
+        plaintext = decrypt(ciphertext, key)
+        if plaintext not in candidates and len(candidates) < top:
+            candidates[plaintext] = Candidate(key, -fitness / total, plaintext)
+    return list(candidates.values())
@@ -4,6 +4,20 @@ Dual-mode encryption supporting letters (A-Z) and XOR (bytes) modes.
 """
 
 import base64
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from contextlib import contextmanager
+from .buffers import as_bytes_view, xor_bytes
+
+# Bytes XORed per step when streaming files
+CHUNK_SIZE = 1024 * 1024
+
+# Encrypted files start with the pad offset they were encrypted at
+_OFFSET_HEADER = struct.Struct('>Q')
 
 
 def _normalize_text_letters(text):
@@ -19,6 +33,52 @@ def _normalize_text_letters(text):
     return ''.join(filter(str.isalpha, text)).upper()
 
 
+def _key_to_bytes(key):
+    """Convert a string key to UTF-8 bytes, leaving bytes-like keys untouched"""
+    if isinstance(key, str):
+        return key.encode('utf-8')
+    return key
+
+
+def encrypt_bytes(data, key, out=None):
+    """
+    Encrypt raw bytes using One-Time Pad XOR.
+    
+    Args:
+        data: bytes, bytearray or memoryview to encrypt
+        key: Pad of exactly the same length (string or bytes-like)
+        out: Optional writable buffer of at least len(data) bytes
+        
+    Returns:
+        XOR of data and key (bytearray, or a memoryview over out)
+        
+    Raises:
+        ValueError: If the key length does not match the data length
+    """
+    data = as_bytes_view(data)
+    key_bytes = as_bytes_view(_key_to_bytes(key))
+    
+    if len(key_bytes) != len(data):
+        raise ValueError(f"Key length ({len(key_bytes)} bytes) must equal data length ({len(data)} bytes) for XOR mode")
+    
+    return xor_bytes(data, key_bytes, out=out)
+
+
+def decrypt_bytes(data, key, out=None):
+    """
+    Decrypt raw bytes using One-Time Pad XOR (the same operation as encryption).
+    
+    Args:
+        data: bytes, bytearray or memoryview to decrypt
+        key: Pad of exactly the same length (string or bytes-like)
+        out: Optional writable buffer of at least len(data) bytes
+        
+    Returns:
+        Plain bytes (bytearray, or a memoryview over out)
+    """
+    return encrypt_bytes(data, key, out=out)
+
+
 def encrypt(text, key, mode='letters', fmt='hex'):
     """
     Encrypt text using One-Time Pad in either letters or XOR mode.
@@ -58,18 +118,13 @@ def encrypt(text, key, mode='letters', fmt='hex'):
     elif mode == 'xor':
         # XOR mode: byte-wise XOR
         text_bytes = text.encode('utf-8')
-        
-        # Convert key to bytes if it's a string
-        if isinstance(key, str):
-            key_bytes = key.encode('utf-8')
-        else:
-            key_bytes = key
+        key_bytes = _key_to_bytes(key)
             
         if len(key_bytes) != len(text_bytes):
             raise ValueError(f"Key length ({len(key_bytes)} bytes) must equal plaintext length ({len(text_bytes)} bytes) for XOR mode")
         
         # Perform XOR operation
-        result_bytes = bytes([text_bytes[i] ^ key_bytes[i] for i in range(len(text_bytes))])
+        result_bytes = encrypt_bytes(text_bytes, key_bytes)
         
         # Return in specified format
         if fmt == 'hex':
@@ -136,20 +191,220 @@ def decrypt(text, key, mode='letters', fmt='hex'):
         else:
             raise ValueError("Format must be 'hex' or 'base64'")
         
-        # Convert key to bytes if it's a string
-        if isinstance(key, str):
-            key_bytes = key.encode('utf-8')
-        else:
-            key_bytes = key
+        key_bytes = _key_to_bytes(key)
             
         if len(key_bytes) != len(text_bytes):
             raise ValueError(f"Key length ({len(key_bytes)} bytes) must equal ciphertext length ({len(text_bytes)} bytes) for XOR mode")
         
         # Perform XOR operation (same as encryption)
-        result_bytes = bytes([text_bytes[i] ^ key_bytes[i] for i in range(len(text_bytes))])
+        result_bytes = decrypt_bytes(text_bytes, key_bytes)
         
         # Convert back to string
         return result_bytes.decode('utf-8')
     
     else:
-        raise ValueError("Mode must be 'letters' or 'xor'")
\ No newline at end of file
+        raise ValueError("Mode must be 'letters' or 'xor'")
+
+
+def _cursor_path(pad_path):
+    """Path of the file recording which pad segments have been consumed"""
+    return os.fspath(pad_path) + '.cursor'
+
+
+@contextmanager
+def _cursor_lock(pad_path):
+    """
+    Hold an exclusive lock on '<pad_path>.lock' (across threads and processes)
+    The lock covers the whole read-check-write of the cursor file, so two
+    concurrent claims can never be handed the same pad bytes.
+    """
+    with open(os.fspath(pad_path) + '.lock', 'a+b') as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            # Windows: lock the first byte of the lock file, retrying while busy
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _load_consumed(pad_path):
+    """
+    Load the consumed pad segments.
+    
+    Returns:
+        Sorted list of [start, end) byte ranges already used
+    """
+    try:
+        with open(_cursor_path(pad_path), 'r', encoding='utf-8') as f:
+            return sorted(json.load(f)['consumed'])
+    except FileNotFoundError:
+        return []
+
+
+def _claim_pad_segment(pad_path, start, length):
+    """
+    Record a pad segment as consumed before it is used.
+    
+    Args:
+        pad_path: Path of the pad file
+        start: Offset of the segment in the pad, or None for the end of the
+            consumed region (chosen while the cursor is locked)
+        length: Length of the segment in bytes
+        
+    Returns:
+        Offset of the claimed segment
+        
+    Raises:
+        ValueError: If the segment overlaps a consumed one or exceeds the pad
+    """
+    with _cursor_lock(pad_path):
+        consumed = _load_consumed(pad_path)
+        if start is None:
+            start = max((end for _, end in consumed), default=0)
+        _record_segment(pad_path, consumed, start, length)
+    return start
+
+
+def _record_segment(pad_path, consumed, start, length):
+    """Check a segment against the consumed ones and write the updated cursor (lock held)"""
+    end = start + length
+    pad_size = os.path.getsize(pad_path)
+    if end > pad_size:
+        raise ValueError(f"Pad too short: need bytes {start}-{end}, pad has {pad_size} bytes")
+    
+    for used_start, used_end in consumed:
+        if start < used_end and used_start < end:
+            raise ValueError(f"Pad bytes {start}-{end} overlap already consumed segment {used_start}-{used_end}")
+    
+    # Merge touching ranges so the cursor file stays small
+    merged = []
+    for segment in sorted(consumed + [[start, end]]):
+        if merged and segment[0] <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], segment[1])
+        else:
+            merged.append(list(segment))
+    
+    # Write atomically so a crash never forgets a consumed segment
+    cursor_path = _cursor_path(pad_path)
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(cursor_path) + '.',
+                                     suffix='.tmp', dir=os.path.dirname(cursor_path) or None)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'consumed': merged}, f)
+        os.replace(temp_path, cursor_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _xor_file_with_pad(source, offset, length, pad_path, outfile, chunk_size):
+    """XOR length bytes of a memory-mapped source with the pad starting at offset"""
+    if length == 0:
+        return
+    
+    with open(pad_path, 'rb') as pad_file, \
+            mmap.mmap(pad_file.fileno(), 0, access=mmap.ACCESS_READ) as pad_map:
+        pad_view = memoryview(pad_map)
+        out = bytearray(min(chunk_size, length))
+        try:
+            for position in range(0, length, chunk_size):
+                size = min(chunk_size, length - position)
+                pad_chunk = pad_view[offset + position:offset + position + size]
+                outfile.write(xor_bytes(source[position:position + size], pad_chunk, out=out))
+                pad_chunk.release()
+        finally:
+            pad_view.release()
+
+
+def encrypt_file(input_path, pad_path, output_path, chunk_size=CHUNK_SIZE):
+    """
+    Encrypt a file with a pad file in XOR mode, never reusing pad bytes.
+    
+    The input and pad are memory-mapped and XORed chunk by chunk. The pad
+    segment is taken from the end of the consumed region recorded in
+    '<pad_path>.cursor', and the output starts with its 8-byte offset.
+    
+    Args:
+        input_path: File to encrypt
+        pad_path: Pad file (must have enough unused bytes left)
+        output_path: Destination for the encrypted file
+        chunk_size: Bytes XORed per step
+        
+    Returns:
+        Offset of the pad segment used
+        
+    Raises:
+        ValueError: If the pad does not have enough unused bytes left
+    """
+    length = os.path.getsize(input_path)
+    offset = _claim_pad_segment(pad_path, None, length)
+    
+    with open(output_path, 'wb') as outfile:
+        outfile.write(_OFFSET_HEADER.pack(offset))
+        if length:
+            with open(input_path, 'rb') as infile, \
+                    mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                source_view = memoryview(source)
+                try:
+                    _xor_file_with_pad(source_view, offset, length, pad_path, outfile, chunk_size)
+                finally:
+                    source_view.release()
+    
+    return offset
+
+
+def decrypt_file(input_path, pad_path, output_path, chunk_size=CHUNK_SIZE):
+    """
+    Decrypt a file produced by encrypt_file with the receiver's copy of the pad.
+    
+    The pad segment named in the file header is marked as consumed in
+    '<pad_path>.cursor', so a ciphertext reusing pad bytes is refused.
+    
+    Args:
+        input_path: Encrypted file (offset header first)
+        pad_path: Pad file
+        output_path: Destination for the decrypted file
+        chunk_size: Bytes XORed per step
+        
+    Returns:
+        Offset of the pad segment used
+        
+    Raises:
+        ValueError: For a malformed file or an already consumed pad segment
+    """
+    length = os.path.getsize(input_path) - _OFFSET_HEADER.size
+    if length < 0:
+        raise ValueError("Encrypted file is too short to contain a pad offset")
+    
+    with open(input_path, 'rb') as infile:
+        offset, = _OFFSET_HEADER.unpack(infile.read(_OFFSET_HEADER.size))
+        _claim_pad_segment(pad_path, offset, length)
+        
+        with open(output_path, 'wb') as outfile:
+            if length:
+                with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                    source_view = memoryview(source)
+                    try:
+                        _xor_file_with_pad(source_view[_OFFSET_HEADER.size:], offset, length,
+                                           pad_path, outfile, chunk_size)
+                    finally:
+                        source_view.release()
+    
+    return offset
@@ -0,0 +1,57 @@
+"""
+Parallel Segment Helpers
+Splits block-aligned buffers into segments and runs them on a thread pool
+"""
+import os
+
+# Segments smaller than this are not worth handing to another thread
+MIN_SEGMENT_SIZE = 256 * 1024
+
+
+def resolve_workers(workers):
+    """Return the number of workers to use (None means one per CPU core)"""
+    if workers is None:
+        return os.cpu_count() or 1
+    workers = int(workers)
+    if workers < 1:
+        raise ValueError("Number of workers must be at least 1")
+    return workers
+
+
+def split_segments(length, block_size, workers, min_size=MIN_SEGMENT_SIZE):
+    """
+    Split a buffer into contiguous segments aligned to the block size
+    Args:
+        length: Total buffer length in bytes
+        block_size: Every segment boundary is a multiple of this
+        workers: Maximum number of segments to produce
+        min_size: Smallest segment worth creating
+    Returns:
+        List of (start, end) byte offsets covering the whole buffer
+    """
+    if length == 0:
+        return [(0, 0)]
+
+    blocks = -(-length // block_size)
+    count = max(1, min(workers, length // max(min_size, block_size)))
+    per_segment = -(-blocks // count) * block_size
+
+    segments = []
+    for start in range(0, length, per_segment):
+        segments.append((start, min(start + per_segment, length)))
+    return segments
+
+
+def run_segments(func, segments, workers):
+    """
+    Call func(start, end) for every segment and return results in order
+    The GIL is released inside PyCryptodome, so threads give real parallelism.
+    """
+    if len(segments) == 1 or workers == 1:
+        return [func(start, end) for start, end in segments]
+
+    # Imported here: concurrent.futures is only worth loading for real fan-out
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(workers, len(segments))) as pool:
+        futures = [pool.submit(func, start, end) for start, end in segments]
+        return [future.result() for future in futures]
@@ -3,15 +3,12 @@ Permutation Cipher Implementation
 Rearranges characters in fixed-size blocks based on a permutation key
 """
 
-def encrypt(text, key):
-    """
-    Encrypt text using permutation cipher
-    Args:
-        text: Plain text to encrypt
-        key: Permutation key (e.g., "3,1,4,2" for block size 4)
-    Returns:
-        Encrypted text (padded to complete blocks with 'X')
-    """
+# Default number of bytes read per iteration by the streaming API
+CHUNK_SIZE = 64 * 1024
+
+
+def _parse_key(key):
+    """Parse and validate the key into a 0-based permutation list"""
     try:
         perm = [int(x) - 1 for x in key.replace(' ', '').split(',')]
     except ValueError:
@@ -23,52 +20,153 @@ def encrypt(text, key):
     if sorted(perm) != list(range(block_size)):
         raise ValueError(f"Key must be a permutation of numbers 1 to {block_size}")
     
-    # Pad text with 'X' to complete blocks (standard practice in cryptography)
-    padding_needed = (block_size - len(text) % block_size) % block_size
-    padded_text = text + 'X' * padding_needed
+    return perm
+
+
+def compile_key(key):
+    """
+    Parse and validate the key once
+    Args:
+        key: Permutation key (e.g., "3,1,4,2"), or a tuple from compile_key
+    Returns:
+        Tuple of 0-based source positions for each block position
+    """
+    if isinstance(key, tuple):
+        return key
+    return tuple(_parse_key(key))
+
+
+def _inverse(perm):
+    """Create inverse permutation"""
+    inv_perm = [0] * len(perm)
+    for i in range(len(perm)):
+        inv_perm[perm[i]] = i
+    return inv_perm
+
+
+def _gather(data, perm):
+    """
+    Apply a block permutation to the whole buffer at once
+    Output position j of every block takes input position perm[j], which is
+    the strided slice data[perm[j]::block_size]; one slice per key position
+    replaces a per-block loop. Works on str, bytes and bytearray.
+    """
+    block_size = len(perm)
+    if len(data) % block_size:
+        raise ValueError(f"Text length must be a multiple of the block size ({block_size})")
     
-    # Apply permutation to each block
-    result = []
-    for i in range(0, len(padded_text), block_size):
-        block = padded_text[i:i + block_size]
-        permuted_block = ''.join([block[perm[j]] for j in range(block_size)])
-        result.append(permuted_block)
+    if isinstance(data, str):
+        result = [''] * len(data)
+        for j in range(block_size):
+            result[j::block_size] = data[perm[j]::block_size]
+        return ''.join(result)
+    
+    result = bytearray(len(data))
+    for j in range(block_size):
+        result[j::block_size] = data[perm[j]::block_size]
+    return bytes(result)
+
+
+def _pad(data, block_size):
+    """Pad with 'X' to complete blocks (standard practice in cryptography)"""
+    padding_needed = (block_size - len(data) % block_size) % block_size
+    filler = 'X' if isinstance(data, str) else b'X'
+    return data + filler * padding_needed
+
+
+def encrypt(text, key):
+    """
+    Encrypt text using permutation cipher
+    Args:
+        text: Plain text to encrypt (str, or bytes-like for raw data)
+        key: Permutation key (e.g., "3,1,4,2" for block size 4)
+    Returns:
+        Encrypted text (padded to complete blocks with 'X')
+    """
+    perm = compile_key(key)
+    if not isinstance(text, (str, bytes)):
+        text = bytes(text)
     
     # Return complete encrypted text including padding
-    return ''.join(result)
+    return _gather(_pad(text, len(perm)), perm)
 
 
 def decrypt(text, key):
     """
     Decrypt text using permutation cipher
     Args:
-        text: Cipher text to decrypt
+        text: Cipher text to decrypt (str, or bytes-like for raw data)
         key: Permutation key (e.g., "3,1,4,2" for block size 4)
     Returns:
         Decrypted text (with padding removed)
     """
-    try:
-        perm = [int(x) - 1 for x in key.replace(' ', '').split(',')]
-    except ValueError:
-        raise ValueError("Key must be comma-separated numbers (e.g., '3,1,4,2')")
-    
-    block_size = len(perm)
-    
-    # Validate permutation
-    if sorted(perm) != list(range(block_size)):
-        raise ValueError(f"Key must be a permutation of numbers 1 to {block_size}")
-    
-    # Create inverse permutation
-    inv_perm = [0] * block_size
-    for i in range(block_size):
-        inv_perm[perm[i]] = i
-    
-    # Apply inverse permutation to each block
-    result = []
-    for i in range(0, len(text), block_size):
-        block = text[i:i + block_size]
-        unpermuted_block = ''.join([block[inv_perm[j]] for j in range(block_size)])
-        result.append(unpermuted_block)
+    inv_perm = _inverse(compile_key(key))
+    if not isinstance(text, (str, bytes)):
+        text = bytes(text)
     
     # Remove padding (trailing 'X' characters)
-    return ''.join(result).rstrip('X')
+    result = _gather(text, inv_perm)
+    return result.rstrip('X' if isinstance(result, str) else b'X')
+
+
+def _read_blocks(infile, block_size, chunk_size):
+    """Yield chunks of whole blocks from a binary stream, then the final partial tail"""
+    chunk_size = max(block_size, chunk_size - chunk_size % block_size)
+    tail = b''
+    while True:
+        chunk = infile.read(chunk_size)
+        if not chunk:
+            break
+        if tail:
+            chunk = tail + chunk
+        full = len(chunk) - len(chunk) % block_size
+        tail = chunk[full:]
+        if full:
+            yield chunk[:full]
+    if tail:
+        yield tail
+
+
+def encrypt_stream(infile, outfile, key, chunk_size=CHUNK_SIZE):
+    """
+    Encrypt a binary stream using permutation cipher, whole blocks at a time
+    Args:
+        infile: Readable binary file-like object
+        outfile: Writable binary file-like object
+        key: Permutation key (e.g., "3,1,4,2" for block size 4)
+        chunk_size: Approximate number of bytes processed per iteration
+    Returns:
+        Number of bytes written
+    """
+    perm = compile_key(key)
+    written = 0
+    for chunk in _read_blocks(infile, len(perm), chunk_size):
+        # Only the final partial block is ever padded
+        written += outfile.write(_gather(_pad(chunk, len(perm)), perm))
+    return written
+
+
+def decrypt_stream(infile, outfile, key, chunk_size=CHUNK_SIZE):
+    """
+    Decrypt a binary stream produced by encrypt_stream
+    Args:
+        infile: Readable binary file-like object
+        outfile: Writable binary file-like object
+        key: Permutation key (e.g., "3,1,4,2" for block size 4)
+        chunk_size: Approximate number of bytes processed per iteration
+    Returns:
+        Number of bytes written (trailing 'X' padding removed)
+    """
+    inv_perm = _inverse(compile_key(key))
+    written = 0
+    
+    # Trailing 'X' bytes are held back until we know they are not the end
+    pending_x = 0
+    for chunk in _read_blocks(infile, len(inv_perm), chunk_size):
+        decrypted = _gather(chunk, inv_perm)
+        stripped = decrypted.rstrip(b'X')
+        if stripped:
+            written += outfile.write(b'X' * pending_x + stripped)
+            pending_x = 0
+        pending_x += len(decrypted) - len(stripped)
+    return written
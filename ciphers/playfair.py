@@ -2,7 +2,24 @@
 Playfair Cipher Implementation
 Uses a 5x5 matrix of letters for digraph substitution
 """
+import math
+import operator
+import random
 import string
+from functools import lru_cache
+from types import MappingProxyType
+from .analysis import Candidate, load_quadgram_table, quadgram_ids
+from .keycache import FrozenKey
+from .parallel import resolve_workers
+
+# Letters of the 5x5 matrix (J is merged into I)
+ALPHABET = string.ascii_uppercase.replace('J', '')
+
+# Annealing steps a chain runs between two progress reports
+SEGMENT_SIZE = 2000
+
+# Per-process annealing state set up once by _init_annealer
+_annealer = {}
 
 def _create_playfair_matrix(key):
     """Create 5x5 Playfair matrix from key"""
@@ -26,15 +43,6 @@ def _create_playfair_matrix(key):
     return matrix
 
 
-def _find_position(matrix, char):
-    """Find row and column of character in matrix"""
-    for i, row in enumerate(matrix):
-        for j, c in enumerate(row):
-            if c == char:
-                return i, j
-    return None, None
-
-
 def _prepare_text(text):
     """Prepare text for Playfair encryption"""
     text = text.upper().replace('J', 'I')
@@ -60,6 +68,88 @@ def _prepare_text(text):
     return ''.join(prepared)
 
 
+def _build_digraph_table(matrix, positions, step):
+    """
+    Precompute the substitution of all 625 digraphs for one direction
+    Args:
+        matrix: 5x5 Playfair matrix
+        positions: Mapping of letter to (row, col) in the matrix
+        step: 1 for encryption, -1 for decryption
+    Returns:
+        Dictionary mapping each two-letter string to its substitute
+    """
+    table = {}
+    for char1, (row1, col1) in positions.items():
+        for char2, (row2, col2) in positions.items():
+            if row1 == row2:  # Same row
+                pair = matrix[row1][(col1 + step) % 5] + matrix[row2][(col2 + step) % 5]
+            elif col1 == col2:  # Same column
+                pair = matrix[(row1 + step) % 5][col1] + matrix[(row2 + step) % 5][col2]
+            else:  # Rectangle
+                pair = matrix[row1][col2] + matrix[row2][col1]
+            table[char1 + char2] = pair
+    return table
+
+
+class PlayfairKey(FrozenKey):
+    """
+    Compiled Playfair key: matrix, letter positions and digraph tables
+    Building these once turns encryption into one lookup per pair.
+    Args:
+        key: Keyword for generating the matrix
+    """
+    __slots__ = ('matrix', 'positions', '_encrypt_table', '_decrypt_table')
+
+    def __init__(self, key):
+        if not key:
+            raise ValueError("Key cannot be empty for Playfair cipher")
+        
+        self.matrix = tuple(tuple(row) for row in _create_playfair_matrix(key))
+        self.positions = MappingProxyType({c: (i, j) for i, row in enumerate(self.matrix)
+                                           for j, c in enumerate(row)})
+        # Private plain dicts: a read-only proxy slows every digraph lookup
+        self._encrypt_table = _build_digraph_table(self.matrix, self.positions, 1)
+        self._decrypt_table = _build_digraph_table(self.matrix, self.positions, -1)
+
+    def __repr__(self):
+        return f"PlayfairKey({''.join(''.join(row) for row in self.matrix)!r})"
+
+    def encrypt(self, text):
+        """Encrypt text with this key"""
+        return _substitute_pairs(_prepare_text(text), self._encrypt_table)
+
+    def decrypt(self, text):
+        """Decrypt text with this key"""
+        text = text.upper().replace('J', 'I')
+        text = ''.join([c for c in text if c in string.ascii_uppercase])
+        return _substitute_pairs(text, self._decrypt_table)
+
+
+def _substitute_pairs(text, table):
+    """Replace every digraph of text through table (a trailing odd letter is dropped)"""
+    return ''.join(map(table.__getitem__, map(operator.add, text[0::2], text[1::2])))
+
+
+@lru_cache(maxsize=128)
+def _compile_cached(key):
+    return PlayfairKey(key)
+
+
+def compile_key(key):
+    """
+    Build a reusable PlayfairKey
+    Args:
+        key: Keyword for generating the matrix (or an existing PlayfairKey)
+    Returns:
+        PlayfairKey
+    """
+    if isinstance(key, PlayfairKey):
+        return key
+    if not key:
+        raise ValueError("Key cannot be empty for Playfair cipher")
+    return _compile_cached(key)
+
+
 def encrypt(text, key):
     """
     Encrypt text using Playfair cipher
@@ -69,29 +159,7 @@ def encrypt(text, key):
     Returns:
         Encrypted text
     """
-    if not key:
-        raise ValueError("Key cannot be empty for Playfair cipher")
-    
-    matrix = _create_playfair_matrix(key)
-    prepared_text = _prepare_text(text)
-    
-    result = []
-    for i in range(0, len(prepared_text), 2):
-        char1, char2 = prepared_text[i], prepared_text[i + 1]
-        row1, col1 = _find_position(matrix, char1)
-        row2, col2 = _find_position(matrix, char2)
-        
-        if row1 == row2:  # Same row
-            result.append(matrix[row1][(col1 + 1) % 5])
-            result.append(matrix[row2][(col2 + 1) % 5])
-        elif col1 == col2:  # Same column
-            result.append(matrix[(row1 + 1) % 5][col1])
-            result.append(matrix[(row2 + 1) % 5][col2])
-        else:  # Rectangle
-            result.append(matrix[row1][col2])
-            result.append(matrix[row2][col1])
-    
-    return ''.join(result)
+    return compile_key(key).encrypt(text)
 
 
 def decrypt(text, key):
@@ -103,29 +171,176 @@ def decrypt(text, key):
     Returns:
         Decrypted text
     """
-    if not key:
-        raise ValueError("Key cannot be empty for Playfair cipher")
+    return compile_key(key).decrypt(text)
+
+
+def _position_rules():
+    """
+    Decryption rules of the 25 matrix positions as a (625, 2) array
+    The digraph rules only depend on where two letters sit, so the table of
+    the plain alphabet matrix (letter i at position i) serves every key:
+    row p1 * 25 + p2 holds the positions of the two plain letters.
+    """
+    import numpy as np
+    matrix = _create_playfair_matrix('')
+    positions = {c: (i, j) for i, row in enumerate(matrix) for j, c in enumerate(row)}
+    table = _build_digraph_table(matrix, positions, -1)
+    return np.array([[ALPHABET.index(c) for c in table[a + b]]
+                     for a in ALPHABET for b in ALPHABET])
+
+
+def _init_annealer(pairs, table_path):
+    """Share the ciphertext digraphs and the (memory-mapped) quadgram table with a process"""
+    import numpy as np
+    _annealer['first'], _annealer['second'] = pairs
+    _annealer['table'] = load_quadgram_table(table_path)
+    _annealer['rules'] = _position_rules()
+    # Matrix letter index to quadgram letter code (J = 9 is skipped)
+    _annealer['codes'] = np.array([ord(c) - 65 for c in ALPHABET])
+
+
+def _fitness(key):
+    """
+    Total quadgram log10 fitness of the ciphertext decrypted with a candidate matrix
+    Args:
+        key: Array of 25 letter indices in matrix order (row by row)
+    """
+    import numpy as np
+    position = np.empty(25, dtype=np.int64)
+    position[key] = np.arange(25)
+    rules = _annealer['rules'][position[_annealer['first']] * 25 + position[_annealer['second']]]
+    plain = _annealer['codes'][key[rules]].ravel()
+    return float(_annealer['table'][quadgram_ids(plain)].sum())
+
+
+def _mutate(key, rng):
+    """Random neighbouring matrix: mostly a two-letter swap, sometimes a row/column move"""
+    key = key.copy()
+    grid = key.reshape(5, 5)
+    move = rng.random()
+    if move < 0.9:
+        a, b = rng.sample(range(25), 2)
+        key[a], key[b] = key[b], key[a]
+    elif move < 0.94:
+        a, b = rng.sample(range(5), 2)
+        grid[[a, b]] = grid[[b, a]]
+    elif move < 0.98:
+        a, b = rng.sample(range(5), 2)
+        grid[:, [a, b]] = grid[:, [b, a]]
+    else:
+        # Transposing the matrix keeps every row/column relationship
+        key[:] = grid.T.ravel()
+    return key
+
+
+def _anneal_segment(key, fitness, best_key, best_fitness, start, stop,
+                    iterations, temperature, seed):
+    """
+    Run steps [start, stop) of one annealing chain
+    Worse candidates are accepted with probability exp(delta / T), so the
+    chain can leave local optima; T cools linearly to a quarter of its
+    starting value (cooling further only freezes the chain in place).
+    Returns:
+        Tuple (key, fitness, best_key, best_fitness) to resume from
+    """
+    rng = random.Random(seed)
+    for step in range(start, stop):
+        t = temperature * (1 - 0.75 * step / iterations)
+        candidate = _mutate(key, rng)
+        candidate_fitness = _fitness(candidate)
+        delta = candidate_fitness - fitness
+        if delta >= 0 or rng.random() < math.exp(delta / t):
+            key, fitness = candidate, candidate_fitness
+            if fitness > best_fitness:
+                best_key, best_fitness = key, fitness
+    return key, fitness, best_key, best_fitness
+
+
+def _key_string(key):
+    """Turn an array of 25 letter indices into a Playfair key"""
+    return ''.join(ALPHABET[i] for i in key)
+
+
+def crack(ciphertext, chains=None, iterations=200000, temperature=None, workers=None,
+          progress=None, table=None, seed=None):
+    """
+    Recover a Playfair key by simulated annealing on quadgram fitness
+    Candidate matrices are scored through a precomputed 625-entry digraph
+    table of matrix positions; independent chains run on a process pool.
+    A single chain may stall on a near miss, so more chains find the key
+    more reliably.
+    Args:
+        ciphertext: Cipher text (a few hundred letters or more works best)
+        chains: Number of independent annealing chains (defaults to one per worker)
+        iterations: Annealing steps per chain
+        temperature: Starting temperature (defaults to one scaled to the text length)
+        workers: Number of processes (defaults to one per CPU core)
+        progress: Optional callback progress(fraction_done, best_candidate)
+        table: Quadgram table path from build_quadgram_table (the default,
+            built from the small bundled sample, is only good for demos)
+        seed: Seed for reproducible chains
+    Returns:
+        Candidate(key, score, plaintext) of the best chain, where key is the
+        25-letter matrix read row by row and score is the mean -log10 per quadgram
+    """
+    import numpy as np
+    letters = [ALPHABET.index(c) for c in ciphertext.upper().replace('J', 'I') if c in ALPHABET]
+    letters = letters[:len(letters) - len(letters) % 2]
+    if len(letters) < 4:
+        raise ValueError("Cipher text is too short to analyse")
     
-    matrix = _create_playfair_matrix(key)
-    text = text.upper().replace('J', 'I')
-    text = ''.join([c for c in text if c in string.ascii_uppercase])
+    pairs = (np.array(letters[0::2]), np.array(letters[1::2]))
+    quadgrams = len(letters) - 3
+    workers = resolve_workers(workers)
+    chains = chains or workers
+    workers = min(workers, chains)
+    if temperature is None:
+        temperature = quadgrams / 50
     
-    result = []
-    for i in range(0, len(text), 2):
-        if i + 1 >= len(text):
-            break
-        char1, char2 = text[i], text[i + 1]
-        row1, col1 = _find_position(matrix, char1)
-        row2, col2 = _find_position(matrix, char2)
-        
-        if row1 == row2:  # Same row
-            result.append(matrix[row1][(col1 - 1) % 5])
-            result.append(matrix[row2][(col2 - 1) % 5])
-        elif col1 == col2:  # Same column
-            result.append(matrix[(row1 - 1) % 5][col1])
-            result.append(matrix[(row2 - 1) % 5][col2])
-        else:  # Rectangle
-            result.append(matrix[row1][col2])
-            result.append(matrix[row2][col1])
+    load_quadgram_table(table)  # Build the default table once, before any fork
+    base_seed = random.randrange(2 ** 32) if seed is None else seed
+    
+    # Every chain starts from its own random matrix
+    _init_annealer(pairs, table)
+    states = []
+    for chain in range(chains):
+        key = np.array(random.Random(base_seed - chain - 1).sample(range(25), 25))
+        fitness = _fitness(key)
+        states.append((key, fitness, key, fitness))
+    
+    def segment_jobs(start):
+        # Chains advance in lock-step segments so progress can be reported between them
+        stop = min(start + SEGMENT_SIZE, iterations)
+        jobs = [(*state, start, stop, iterations, temperature,
+                 base_seed + chain * iterations + start)
+                for chain, state in enumerate(states)]
+        return jobs, stop
     
-    return ''.join(result)
+    def report(done):
+        if progress:
+            best = max(states, key=lambda state: state[3])
+            progress(done / iterations, _candidate(best[2], best[3], quadgrams, ciphertext))
+    
+    start = 0
+    if workers == 1:
+        while start < iterations:
+            jobs, start = segment_jobs(start)
+            states = [_anneal_segment(*job) for job in jobs]
+            report(start)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_annealer,
+                                 initargs=(pairs, table)) as pool:
+            while start < iterations:
+                jobs, start = segment_jobs(start)
+                states = list(pool.map(_anneal_segment, *zip(*jobs)))
+                report(start)
+    
+    best = max(states, key=lambda state: state[3])
+    return _candidate(best[2], best[3], quadgrams, ciphertext)
+
+
+def _candidate(key, fitness, quadgrams, ciphertext):
+    """Package a chain's best matrix as a Candidate with its decryption"""
+    key = _key_string(key)
+    return Candidate(key, -fitness / quadgrams, decrypt(ciphertext, key))
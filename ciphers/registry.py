@@ -0,0 +1,189 @@
+"""
+Cipher Registry
+Common Cipher interface over the cipher modules, plus a registry plugins can add to
+"""
+import importlib
+from abc import ABC, abstractmethod
+
+# Capabilities a cipher can declare
+BYTES = 'bytes'            # encrypt_bytes/decrypt_bytes on raw buffers
+STREAMING = 'streaming'    # encrypt_stream/decrypt_stream on binary file objects
+PARALLEL = 'parallel'      # multi-threaded paths for large inputs
+CHUNKED = 'chunked'        # input may be split anywhere and processed piece by piece
+
+
+class Cipher(ABC):
+    """
+    Common interface shared by every cipher
+
+    compile_key() turns a user key into an immutable, precomputed key
+    object; encrypt()/decrypt() accept either form, so hot loops can
+    compile once and skip key parsing entirely. encrypt() and decrypt()
+    are abstract: a subclass missing either cannot be instantiated.
+
+    Attributes:
+        name: Registry name (e.g. 'caesar')
+        label: Human readable name shown in the GUI
+        key_hint: Short description of the expected key format
+        capabilities: frozenset of BYTES, STREAMING, PARALLEL and CHUNKED
+        options: Extra keyword options accepted by encrypt/decrypt
+    """
+    name = None
+    label = None
+    key_hint = "Enter encryption key"
+    capabilities = frozenset()
+    options = ()
+
+    def compile_key(self, key):
+        """Return a precomputed key object (the key itself by default)"""
+        return key
+
+    @abstractmethod
+    def encrypt(self, text, key, **options):
+        """Encrypt text with a user key or a compiled key"""
+
+    @abstractmethod
+    def decrypt(self, text, key, **options):
+        """Decrypt text with a user key or a compiled key"""
+
+    def encrypt_many(self, texts, key, **options):
+        """Encrypt every text of an iterable with one compiled key"""
+        compiled = self.compile_key(key)
+        return [self.encrypt(text, compiled, **options) for text in texts]
+
+    def decrypt_many(self, texts, key, **options):
+        """Decrypt every text of an iterable with one compiled key"""
+        compiled = self.compile_key(key)
+        return [self.decrypt(text, compiled, **options) for text in texts]
+
+    def supports(self, capability):
+        """Return True if the cipher declares the given capability"""
+        return capability in self.capabilities
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class ModuleCipher(Cipher):
+    """
+    Cipher backed by a module exposing encrypt/decrypt (and optionally
+    compile_key, *_bytes and *_stream functions), imported on first use
+    """
+
+    def __init__(self, name, label, module_name, key_hint=None,
+                 capabilities=(), options=()):
+        self.name = name
+        self.label = label
+        self.module_name = module_name
+        if key_hint:
+            self.key_hint = key_hint
+        self.capabilities = frozenset(capabilities)
+        self.options = tuple(options)
+        self._module = None
+
+    @property
+    def module(self):
+        """The implementing module (imported lazily)"""
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        return self._module
+
+    def __getstate__(self):
+        # Modules do not pickle; the worker process re-imports it on first use
+        state = self.__dict__.copy()
+        state['_module'] = None
+        return state
+
+    def compile_key(self, key):
+        compile_key = getattr(self.module, 'compile_key', None)
+        return compile_key(key) if compile_key else key
+
+    def encrypt(self, text, key, **options):
+        return self.module.encrypt(text, key, **options)
+
+    def decrypt(self, text, key, **options):
+        return self.module.decrypt(text, key, **options)
+
+    def _require(self, capability):
+        if capability not in self.capabilities:
+            raise ValueError(f"{self.label} does not support {capability} mode")
+
+    def encrypt_bytes(self, data, key, **options):
+        self._require(BYTES)
+        return self.module.encrypt_bytes(data, key, **options)
+
+    def decrypt_bytes(self, data, key, **options):
+        self._require(BYTES)
+        return self.module.decrypt_bytes(data, key, **options)
+
+    def encrypt_stream(self, infile, outfile, key, **options):
+        self._require(STREAMING)
+        return self.module.encrypt_stream(infile, outfile, key, **options)
+
+    def decrypt_stream(self, infile, outfile, key, **options):
+        self._require(STREAMING)
+        return self.module.decrypt_stream(infile, outfile, key, **options)
+
+
+_registry = {}
+
+
+def register(cipher):
+    """
+    Add a cipher to the registry (replacing any cipher of the same name)
+    Args:
+        cipher: Cipher instance with a unique name
+    Returns:
+        The registered cipher
+    """
+    if not cipher.name:
+        raise ValueError("Cipher must have a name to be registered")
+    _registry[cipher.name] = cipher
+    return cipher
+
+
+def get(name):
+    """Look up a registered cipher by name"""
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown cipher '{name}'. Available: {', '.join(names())}")
+
+
+def names():
+    """Return the names of all registered ciphers, in registration order"""
+    return list(_registry)
+
+
+def available():
+    """Return all registered ciphers, in registration order"""
+    return list(_registry.values())
+
+
+# Built-in ciphers: name, label, module, key hint, capabilities, options
+_BUILTIN_CIPHERS = [
+    ("caesar", "Caesar Cipher", "ciphers.caesar",
+     "Enter shift number (e.g., 3)", (BYTES, CHUNKED), ()),
+    ("monoalphabetic", "Monoalphabetic", "ciphers.monoalphabetic",
+     "Enter 26-letter substitution key", (BYTES, CHUNKED), ()),
+    ("playfair", "Playfair Cipher", "ciphers.playfair",
+     "Enter keyword", (), ()),
+    ("vigenere", "Vigenère Cipher", "ciphers.vigenere",
+     "Enter keyword", (STREAMING,), ()),
+    ("otp", "One-Time Pad", "ciphers.otp",
+     "Enter key (≥ text length)", (BYTES,), ("mode", "fmt")),
+    ("hill", "Hill Cipher", "ciphers.hill",
+     "Enter matrix (e.g., 6,24,1,13 for 2x2)", (), ()),
+    ("row_transposition", "Row Transposition", "ciphers.row_transposition",
+     "Enter numeric key (e.g., 3142)", (), ()),
+    ("permutation", "Permutation", "ciphers.permutation",
+     "Enter permutation (e.g., 3,1,4,2)", (STREAMING,), ()),
+    ("des", "DES", "ciphers.des_cipher",
+     "Enter 8-byte key", (BYTES, PARALLEL), ()),
+    ("aes", "AES", "ciphers.aes_cipher",
+     "Enter encryption key", (BYTES, STREAMING, PARALLEL), ()),
+]
+
+# Modules are only imported when a cipher is first used
+for _entry in _BUILTIN_CIPHERS:
+    register(ModuleCipher(*_entry))
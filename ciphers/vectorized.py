@@ -0,0 +1,39 @@
+"""
+Vectorized Letter Shifting
+NumPy engine for Vigenère on large ASCII texts (loaded on first use)
+"""
+
+# Texts shorter than this are faster on the plain Python path
+VECTOR_THRESHOLD = 2048
+
+
+def use_vectorized(text):
+    """Return True when text is large and pure ASCII (same result as the loop)"""
+    return len(text) >= VECTOR_THRESHOLD and text.isascii()
+
+
+def shift_letters(text, key_shifts):
+    """
+    Shift every ASCII letter of text by a repeating key, keeping case and other characters
+    Args:
+        text: Pure ASCII text
+        key_shifts: Sequence of shifts cycled over the letters only;
+            non-letters do not advance the key
+    Returns:
+        Shifted text
+    """
+    import numpy as np
+    data = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    upper = (data >= 65) & (data <= 90)
+    lower = (data >= 97) & (data <= 122)
+    letters = upper | lower
+
+    # Position of each letter in the key stream, via a running letter count
+    key_index = np.cumsum(letters) - 1
+    key_array = np.asarray(key_shifts, dtype=np.int16) % 26
+    shifts = key_array[key_index % len(key_array)]
+
+    base = np.where(upper, 65, 97).astype(np.int16)
+    shifted = (data.astype(np.int16) - base + shifts) % 26 + base
+    result = np.where(letters, shifted, data).astype(np.uint8)
+    return result.tobytes().decode('ascii')
@@ -2,22 +2,71 @@
 Vigenère Cipher Implementation
 Polyalphabetic substitution using a keyword
 """
+import codecs
+import string
+from functools import lru_cache
+from .analysis import (Candidate, ENGLISH_IOC, RANDOM_IOC, chi_squared_shifts,
+                       column_counts, index_of_coincidence, kasiski_scores, letter_codes)
+from .keycache import FrozenKey
+from .vectorized import use_vectorized, shift_letters
 
-def encrypt(text, key):
+# Letters examined when estimating the key length (the key is solved on the full text)
+ANALYSIS_SAMPLE = 500_000
+
+# Bytes read per iteration when streaming
+CHUNK_SIZE = 64 * 1024
+
+_ASCII_LETTERS = string.ascii_letters.encode('ascii')
+
+
+class VigenereKey(FrozenKey):
     """
-    Encrypt text using Vigenère cipher
+    Validated Vigenère keyword with its precomputed letter shifts
     Args:
-        text: Plain text to encrypt
         key: Keyword for encryption
-    Returns:
-        Encrypted text
     """
-    if not key:
-        raise ValueError("Key cannot be empty for Vigenère cipher")
+    __slots__ = ('key', 'shifts')
+
+    def __init__(self, key):
+        if not key:
+            raise ValueError("Key cannot be empty for Vigenère cipher")
+        
+        key = key.upper()
+        if not all(c.isalpha() for c in key):
+            raise ValueError("Key must contain only letters")
+        
+        self.key = key
+        self.shifts = tuple((ord(c) - 65) % 26 for c in key)
+
+    def __repr__(self):
+        return f"VigenereKey({self.key!r})"
+
+    def encrypt(self, text, offset=0):
+        """Encrypt text with this key, starting offset letters into the key stream"""
+        return _shift_text(text, self.shifts, offset)
+
+    def decrypt(self, text, offset=0):
+        """Decrypt text with this key, starting offset letters into the key stream"""
+        return _shift_text(text, tuple(-shift % 26 for shift in self.shifts), offset)
+
+
+def count_letters(text):
+    """Return how many letters of text advance the key stream"""
+    if text.isascii():
+        data = text.encode('ascii')
+        return len(data) - len(data.translate(None, _ASCII_LETTERS))
+    return sum(char.isalpha() for char in text)
+
+
+def _shift_text(text, shifts, offset=0):
+    """Shift the letters of text by the key shifts, advancing only on letters"""
+    # Continuing a split text: start the key where the previous piece stopped
+    offset %= len(shifts)
+    shifts = shifts[offset:] + shifts[:offset]
     
-    key = key.upper()
-    if not all(c.isalpha() for c in key):
-        raise ValueError("Key must contain only letters")
+    # Large ASCII texts are shifted in bulk
+    if use_vectorized(text):
+        return shift_letters(text, shifts)
     
     result = []
     key_index = 0
@@ -27,10 +76,10 @@ def encrypt(text, key):
             # Determine if uppercase or lowercase
             ascii_offset = 65 if char.isupper() else 97
             # Get shift from key
-            shift = ord(key[key_index % len(key)]) - 65
-            # Encrypt character
-            encrypted = (ord(char) - ascii_offset + shift) % 26
-            result.append(chr(encrypted + ascii_offset))
+            shift = shifts[key_index % len(shifts)]
+            # Shift character
+            shifted = (ord(char) - ascii_offset + shift) % 26
+            result.append(chr(shifted + ascii_offset))
             key_index += 1
         else:
             result.append(char)
@@ -38,36 +87,176 @@ def encrypt(text, key):
     return ''.join(result)
 
 
-def decrypt(text, key):
+@lru_cache(maxsize=128)
+def _compile_cached(key):
+    return VigenereKey(key)
+
+
+def compile_key(key):
+    """
+    Validate a keyword once and return a reusable VigenereKey
+    Args:
+        key: Keyword (or an existing VigenereKey)
+    Returns:
+        VigenereKey
+    """
+    if isinstance(key, VigenereKey):
+        return key
+    if not key:
+        raise ValueError("Key cannot be empty for Vigenère cipher")
+    return _compile_cached(key)
+
+
+def encrypt(text, key, offset=0):
+    """
+    Encrypt text using Vigenère cipher
+    Args:
+        text: Plain text to encrypt
+        key: Keyword for encryption
+        offset: Letters already encrypted before text (to continue a split text)
+    Returns:
+        Encrypted text
+    """
+    return compile_key(key).encrypt(text, offset)
+
+
+def decrypt(text, key, offset=0):
     """
     Decrypt text using Vigenère cipher
     Args:
         text: Cipher text to decrypt
         key: Keyword for decryption
+        offset: Letters already decrypted before text (to continue a split text)
     Returns:
         Decrypted text
     """
-    if not key:
-        raise ValueError("Key cannot be empty for Vigenère cipher")
+    return compile_key(key).decrypt(text, offset)
+
+
+def _process_stream(process, infile, outfile, chunk_size):
+    """Run process over UTF-8 chunks of infile, carrying the key position across them"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    offset = 0
+    written = 0
+    while True:
+        data = infile.read(chunk_size)
+        text = decoder.decode(data, final=not data)
+        if text:
+            written += outfile.write(process(text, offset).encode('utf-8'))
+            offset += count_letters(text)
+        if not data:
+            return written
+
+
+def encrypt_stream(infile, outfile, key, chunk_size=CHUNK_SIZE):
+    """
+    Encrypt a UTF-8 text stream chunk by chunk (same result as encrypt)
+    Args:
+        infile: Readable binary file-like object
+        outfile: Writable binary file-like object
+        key: Keyword for encryption
+        chunk_size: Bytes read per iteration
+    Returns:
+        Number of bytes written
+    """
+    return _process_stream(compile_key(key).encrypt, infile, outfile, chunk_size)
+
+
+def decrypt_stream(infile, outfile, key, chunk_size=CHUNK_SIZE):
+    """
+    Decrypt a UTF-8 text stream chunk by chunk (same result as decrypt)
+    Args:
+        infile: Readable binary file-like object
+        outfile: Writable binary file-like object
+        key: Keyword for decryption
+        chunk_size: Bytes read per iteration
+    Returns:
+        Number of bytes written
+    """
+    return _process_stream(compile_key(key).decrypt, infile, outfile, chunk_size)
+
+
+def _length_scores(codes, max_length):
+    """Score every key length from 1 to max_length (higher is more likely)"""
+    import numpy as np
+    sample = codes[:ANALYSIS_SAMPLE]
+    lengths = np.arange(1, max_length + 1)
     
-    key = key.upper()
-    if not all(c.isalpha() for c in key):
-        raise ValueError("Key must contain only letters")
+    # Columns of the right length read like English; divisors of it do not
+    ioc = np.array([index_of_coincidence(column_counts(sample, length)).mean()
+                    for length in lengths])
+    ioc_score = np.clip((ioc - RANDOM_IOC) / (ENGLISH_IOC - RANDOM_IOC), 0, 1)
     
-    result = []
-    key_index = 0
+    # Repeat spacings divide the right length far more often than its multiples
+    return lengths, ioc_score + kasiski_scores(sample, lengths)
+
+
+def estimate_key_lengths(ciphertext, max_length=20):
+    """
+    Estimate the key length with Kasiski examination and the index of coincidence
+    Args:
+        ciphertext: Cipher text (only its letters are examined)
+        max_length: Longest key length considered
+    Returns:
+        List of (length, score) pairs, most likely first
+    """
+    codes = letter_codes(ciphertext)
+    max_length = max(1, min(max_length, len(codes) // 2))
+    lengths, scores = _length_scores(codes, max_length)
+    order = (-scores).argsort(kind='stable')
+    return [(int(lengths[i]), float(scores[i])) for i in order]
+
+
+def _solve_key(codes, length):
+    """Best key of the given length: a chi-squared Caesar solve per column"""
+    counts = column_counts(codes, length)
+    scores = chi_squared_shifts(counts)
+    shifts = scores.argmin(axis=1)
     
-    for char in text:
-        if char.isalpha():
-            # Determine if uppercase or lowercase
-            ascii_offset = 65 if char.isupper() else 97
-            # Get shift from key
-            shift = ord(key[key_index % len(key)]) - 65
-            # Decrypt character
-            decrypted = (ord(char) - ascii_offset - shift) % 26
-            result.append(chr(decrypted + ascii_offset))
-            key_index += 1
-        else:
-            result.append(char)
+    # Chi-squared grows with the column size, so normalise before averaging
+    fitness = (scores.min(axis=1) / counts.sum(axis=1).clip(min=1)).mean()
+    return ''.join(chr(65 + int(shift)) for shift in shifts), float(fitness)
+
+
+def _shortest_period(key):
+    """Collapse a key that repeats itself (e.g. LEMONLEMON -> LEMON)"""
+    for period in range(1, len(key)):
+        if len(key) % period == 0 and key == key[:period] * (len(key) // period):
+            return key[:period]
+    return key
+
+
+def crack(ciphertext, top=3, max_length=20, key_length=None):
+    """
+    Recover the keyword of a Vigenère ciphertext
+    The most likely key lengths are found with Kasiski examination and the
+    index of coincidence, then every key letter is a chi-squared Caesar solve
+    on its column of the full text.
+    Args:
+        ciphertext: Cipher text with an unknown key (best with ASCII letters)
+        top: Number of key hypotheses to return
+        max_length: Longest key length considered
+        key_length: Known key length (skips the length estimation)
+    Returns:
+        List of Candidate(key, score, plaintext), best (lowest score) first
+    """
+    codes = letter_codes(ciphertext)
+    if len(codes) < 2:
+        raise ValueError("Cipher text is too short to analyse")
     
-    return ''.join(result)
+    if key_length:
+        lengths = [key_length]
+    else:
+        # Multiples of the true length also score well, so try a few extra
+        ranked = estimate_key_lengths(ciphertext, max_length)
+        lengths = [length for length, _ in ranked[:max(2 * top, 4)]]
+    
+    hypotheses = {}
+    for length in lengths:
+        key, fitness = _solve_key(codes, length)
+        key = _shortest_period(key)
+        if key not in hypotheses or fitness < hypotheses[key]:
+            hypotheses[key] = fitness
+    
+    best = sorted(hypotheses.items(), key=lambda item: item[1])[:top]
+    return [Candidate(key, fitness, decrypt(ciphertext, key)) for key, fitness in best]
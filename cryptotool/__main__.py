@@ -0,0 +1,10 @@
+"""
+Command-line entry point
+Usage: python -m cryptotool encrypt --cipher aes --key-file key.txt < in > out
+"""
+import sys
+
+from cryptotool.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
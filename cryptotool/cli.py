@@ -0,0 +1,233 @@
+"""
+Command-Line Interface
+Headless encrypt/decrypt over pipes and directory trees (no GUI dependencies)
+
+Examples:
+    python -m cryptotool encrypt --cipher aes --key-file key.txt < in > out
+    python -m cryptotool decrypt --cipher caesar --key 3 --input-dir enc --output-dir plain
+"""
+import argparse
+import os
+import sys
+import time
+from ciphers import registry
+from ciphers.parallel import resolve_workers
+
+# Bytes read from the input per iteration when streaming
+CHUNK_SIZE = 1024 * 1024
+
+
+class _CountingReader:
+    """Binary reader wrapper that counts the bytes consumed from the input"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.count = 0
+
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self.count += len(data)
+        return data
+
+
+def _cipher_options(cipher, args):
+    """Collect the extra options (e.g. OTP mode/fmt) the user actually set"""
+    options = {}
+    for name in cipher.options:
+        value = getattr(args, name, None)
+        if value is not None:
+            options[name] = value
+    return options
+
+
+def process_stream(cipher, decrypting, infile, outfile, key, options=None,
+                   chunk_size=CHUNK_SIZE):
+    """
+    Encrypt or decrypt a binary stream with the best path the cipher offers
+    Streaming ciphers (AES, Permutation, Vigenère) and ciphers that can be
+    split anywhere (Caesar, Monoalphabetic) run chunk by chunk in constant
+    memory; other byte ciphers (DES, OTP XOR) transform the whole input as
+    raw bytes; the remaining text ciphers (Playfair, Hill, Row Transposition,
+    OTP letters) read the whole input as UTF-8 text.
+    Args:
+        cipher: Registered cipher name or Cipher instance
+        decrypting: True to decrypt, False to encrypt
+        infile: Readable binary file-like object
+        outfile: Writable binary file-like object
+        key: Cipher key
+        options: Extra cipher options (e.g. mode/fmt for OTP)
+        chunk_size: Bytes read per iteration on the streaming paths
+    Returns:
+        Number of input bytes processed
+    """
+    if isinstance(cipher, str):
+        cipher = registry.get(cipher)
+    options = options or {}
+    reader = _CountingReader(infile)
+    key = cipher.compile_key(key)
+
+    if cipher.supports(registry.STREAMING) and not options:
+        process = cipher.decrypt_stream if decrypting else cipher.encrypt_stream
+        process(reader, outfile, key, chunk_size=chunk_size)
+    elif cipher.supports(registry.CHUNKED) and not options:
+        process = cipher.decrypt_bytes if decrypting else cipher.encrypt_bytes
+        while True:
+            chunk = reader.read(chunk_size)
+            if not chunk:
+                break
+            outfile.write(process(chunk, key))
+    elif cipher.supports(registry.BYTES) and not options:
+        process = cipher.decrypt_bytes if decrypting else cipher.encrypt_bytes
+        outfile.write(process(reader.read(), key))
+    else:
+        process = cipher.decrypt if decrypting else cipher.encrypt
+        text = reader.read().decode('utf-8')
+        outfile.write(process(text, key, **options).encode('utf-8'))
+    return reader.count
+
+
+def _process_file(job):
+    """Transform one file of a directory tree (runs inside a worker process)"""
+    cipher, decrypting, key, options, chunk_size, source, target = job
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(source, 'rb') as infile, open(target, 'wb') as outfile:
+        return process_stream(cipher, decrypting, infile, outfile, key,
+                              options, chunk_size)
+
+
+def _walk_files(input_dir, output_dir):
+    """Yield (source, target) paths mirroring input_dir under output_dir"""
+    for root, _dirs, files in os.walk(input_dir):
+        relative = os.path.relpath(root, input_dir)
+        for name in sorted(files):
+            yield (os.path.join(root, name),
+                   os.path.normpath(os.path.join(output_dir, relative, name)))
+
+
+def process_tree(cipher, decrypting, input_dir, output_dir, key, options=None,
+                 workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Encrypt or decrypt every file under input_dir into the same layout under output_dir
+    Args:
+        cipher: Registered cipher name or Cipher instance
+        decrypting: True to decrypt, False to encrypt
+        input_dir: Directory tree to read
+        output_dir: Directory the results are written to (created if missing)
+        key: Cipher key
+        options: Extra cipher options (e.g. mode/fmt for OTP)
+        workers: Number of processes (defaults to one per CPU core)
+        chunk_size: Bytes read per iteration on the streaming paths
+    Returns:
+        Tuple (files processed, input bytes processed)
+    """
+    if isinstance(cipher, str):
+        cipher = registry.get(cipher)
+    if os.path.abspath(input_dir) == os.path.abspath(output_dir):
+        raise ValueError("Output directory must differ from the input directory")
+
+    # Jobs carry the Cipher itself, so plugins also work in spawned workers
+    jobs = [(cipher, decrypting, key, options or {}, chunk_size, source, target)
+            for source, target in _walk_files(input_dir, output_dir)]
+    workers = min(resolve_workers(workers), max(1, len(jobs)))
+
+    if workers == 1:
+        sizes = [_process_file(job) for job in jobs]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            sizes = list(pool.map(_process_file, jobs))
+    return len(jobs), sum(sizes)
+
+
+def _read_key(args):
+    """Return the key from --key or --key-file (trailing newline removed)"""
+    if args.key is not None:
+        return args.key
+    with open(args.key_file, 'r', encoding='utf-8') as f:
+        return f.read().rstrip('\r\n')
+
+
+def _report(label, size, elapsed):
+    """Print a throughput summary to stderr (stdout may carry the data)"""
+    rate = size / elapsed / (1024 * 1024) if elapsed > 0 else float('inf')
+    print(f"{label}: {size} bytes in {elapsed:.3f} s ({rate:.2f} MiB/s)", file=sys.stderr)
+
+
+def build_parser():
+    """Create the argument parser for the cryptotool command"""
+    parser = argparse.ArgumentParser(
+        prog="cryptotool",
+        description="Encrypt or decrypt stdin to stdout, or whole directory trees.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List the available ciphers")
+
+    for command in ("encrypt", "decrypt"):
+        sub = commands.add_parser(command, help=f"{command.capitalize()} data")
+        sub.add_argument("--cipher", required=True, choices=registry.names(),
+                         help="Cipher to use")
+        key_group = sub.add_mutually_exclusive_group(required=True)
+        key_group.add_argument("--key", help="Key given on the command line")
+        key_group.add_argument("--key-file", help="File containing the key")
+        sub.add_argument("--mode", choices=("letters", "xor"),
+                         help="One-Time Pad mode (text path)")
+        sub.add_argument("--fmt", choices=("hex", "base64"),
+                         help="One-Time Pad XOR output format (text path)")
+        sub.add_argument("--input-dir", help="Process every file under this directory")
+        sub.add_argument("--output-dir", help="Where to write the processed directory tree")
+        sub.add_argument("--workers", type=int, default=None,
+                         help="Processes for directory mode (default: one per CPU)")
+        sub.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                         help="Bytes read per iteration by the streaming ciphers "
+                              "(see 'list'; the others read the whole input)")
+        sub.add_argument("--stats", action="store_true",
+                         help="Report throughput on stderr")
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the command-line interface
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "list":
+        for cipher in registry.available():
+            capabilities = ", ".join(sorted(cipher.capabilities)) or "text"
+            print(f"{cipher.name:<18} {cipher.label:<20} {capabilities}")
+        return 0
+
+    if (args.input_dir is None) != (args.output_dir is None):
+        print("Error: --input-dir and --output-dir must be given together", file=sys.stderr)
+        return 2
+    if args.chunk_size < 1:
+        print("Error: --chunk-size must be at least 1", file=sys.stderr)
+        return 2
+
+    decrypting = args.command == "decrypt"
+    try:
+        cipher = registry.get(args.cipher)
+        key = _read_key(args)
+        options = _cipher_options(cipher, args)
+        start = time.perf_counter()
+
+        if args.input_dir:
+            files, size = process_tree(cipher, decrypting, args.input_dir, args.output_dir,
+                                       key, options, args.workers, args.chunk_size)
+            label = f"{files} files"
+        else:
+            size = process_stream(cipher, decrypting, sys.stdin.buffer, sys.stdout.buffer,
+                                  key, options, args.chunk_size)
+            sys.stdout.buffer.flush()
+            label = "stdin"
+
+        if args.stats:
+            _report(label, size, time.perf_counter() - start)
+    except (OSError, ValueError, UnicodeDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
@@ -3,7 +3,6 @@ Main GUI Application using CustomTkinter
 """
 import customtkinter as ctk
 from gui.components import *
-import importlib
 import sys
 from pathlib import Path
 
@@ -11,6 +10,12 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from ciphers import registry
+from gui.worker import CipherWorker, supports_progress
+
+# Milliseconds between checks for events from the background worker
+POLL_INTERVAL = 50
+
 
 class CryptoApp(ctk.CTk):
     def __init__(self):
@@ -24,23 +29,20 @@ class CryptoApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         
-        # Cipher list
-        self.ciphers = {
-            "Caesar Cipher": "ciphers.caesar",
-            "Monoalphabetic": "ciphers.monoalphabetic",
-            "Playfair Cipher": "ciphers.playfair",
-            "Vigenère Cipher": "ciphers.vigenere",
-            "One-Time Pad": "ciphers.otp",
-            "Hill Cipher": "ciphers.hill",
-            "Row Transposition": "ciphers.row_transposition",
-            "Permutation": "ciphers.permutation",
-            "DES": "ciphers.des_cipher",
-            "AES": "ciphers.aes_cipher"
-        }
+        # Cipher list (label -> registered cipher, plugins included)
+        self.ciphers = {cipher.label: cipher for cipher in registry.available()}
         
         self.current_cipher = None
         self.current_cipher_name = None
         
+        # Encrypt/decrypt run on a background thread; one job at a time
+        self.worker = CipherWorker()
+        self.current_job = None
+        self.current_action = None
+        self.show_progress = False
+        self.polling = False
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Create GUI layout
         self.create_layout()
         
@@ -160,7 +162,24 @@ class CryptoApp(ctk.CTk):
         self.key_input = StyledEntry(self.content, placeholder_text="Enter encryption key")
         self.key_input.grid(row=6, column=0, padx=40, pady=(0, 10), sticky="ew")
         
-
+        # Progress frame (shown while a job is running)
+        self.progress_frame = ctk.CTkFrame(self.content, fg_color="transparent")
+        self.progress_frame.grid(row=7, column=0, padx=40, pady=(10, 0), sticky="ew")
+        self.progress_frame.grid_columnconfigure(0, weight=1)
+        self.progress_frame.grid_remove()  # Hidden by default
+        
+        self.progress_bar = ctk.CTkProgressBar(self.progress_frame)
+        self.progress_bar.grid(row=0, column=0, padx=(0, 10), sticky="ew")
+        
+        self.cancel_btn = ctk.CTkButton(
+            self.progress_frame,
+            text="Cancel",
+            width=100,
+            fg_color="gray40",
+            hover_color="gray30",
+            command=self.cancel_job
+        )
+        self.cancel_btn.grid(row=0, column=1, sticky="e")
         
         # Buttons frame
         button_frame = ctk.CTkFrame(self.content, fg_color="transparent")
@@ -199,12 +218,17 @@ class CryptoApp(ctk.CTk):
             else:
                 btn.configure(fg_color="transparent")
         
-        # Load cipher module
+        if self.current_job is not None:
+            self.cancel_job()
+        
+        # Load cipher
         try:
-            module_name = self.ciphers[cipher_name]
-            self.current_cipher = importlib.import_module(module_name)
+            self.current_cipher = self.ciphers[cipher_name]
             self.current_cipher_name = cipher_name
             
+            # Import the implementing module now so load errors show up here
+            getattr(self.current_cipher, "module", None)
+            
             # Update title
             self.cipher_title.configure(text=cipher_name)
             
@@ -213,8 +237,8 @@ class CryptoApp(ctk.CTk):
             self.key_input.delete(0, "end")
             self.output_text.delete("1.0", "end")
             
-            # Handle OTP-specific UI
-            if cipher_name == "One-Time Pad":
+            # Handle OTP-specific UI (mode and format options)
+            if "mode" in self.current_cipher.options:
                 self._show_otp_ui()
             else:
                 self._hide_otp_ui()
@@ -249,61 +273,35 @@ class CryptoApp(ctk.CTk):
     
     def update_key_placeholder(self, cipher_name):
         """Update key input placeholder based on cipher type"""
-        placeholders = {
-            "Caesar Cipher": "Enter shift number (e.g., 3)",
-            "Monoalphabetic": "Enter 26-letter substitution key",
-            "Playfair Cipher": "Enter keyword",
-            "Vigenère Cipher": "Enter keyword",
-            "One-Time Pad": "Enter key (≥ text length)",
-            "Hill Cipher": "Enter matrix (e.g., 6,24,1,13 for 2x2)",
-            "Row Transposition": "Enter numeric key (e.g., 3142)",
-            "Permutation": "Enter permutation (e.g., 3,1,4,2)",
-            "DES": "Enter 8-byte key",
-            "AES": "Enter encryption key"
-        }
-        
-        placeholder = placeholders.get(cipher_name, "Enter encryption key")
+        placeholder = self.ciphers[cipher_name].key_hint
         self.key_input.configure(placeholder_text=placeholder)
     
+    def _cipher_options(self):
+        """Collect the extra options (OTP mode and format) for the selected cipher"""
+        if "mode" not in self.current_cipher.options:
+            return {}
+        
+        mode = "letters" if self.otp_mode_var.get() == "Letters (A-Z)" else "xor"
+        fmt = self.otp_format_var.get() if mode == "xor" else "hex"  # fmt not used for letters mode
+        return {"mode": mode, "fmt": fmt}
+    
     def perform_encrypt(self):
         """Perform encryption"""
-        if not self.current_cipher:
-            self.show_error("Please select a cipher first")
-            return
-        
-        text = self.text_input.get("1.0", "end-1c").strip()
-        key = self.key_input.get().strip()
-        
-        if not text:
-            self.show_error("Please enter text to encrypt")
-            return
-        
-        if not key:
-            self.show_error("Please enter a key")
-            return
-        
-        # Handle OTP with special parameters
-        if self.current_cipher_name == "One-Time Pad":
-            try:
-                mode = "letters" if self.otp_mode_var.get() == "Letters (A-Z)" else "xor"
-                fmt = self.otp_format_var.get() if mode == "xor" else "hex"  # fmt not used for letters mode
-                
-                result = self.current_cipher.encrypt(text, key, mode=mode, fmt=fmt)
-                self.output_text.delete("1.0", "end")
-                self.output_text.insert("1.0", result)
-            except Exception as e:
-                self.show_error(f"Encryption error: {str(e)}")
-        else:
-            # Standard encryption for other ciphers
-            try:
-                result = self.current_cipher.encrypt(text, key)
-                self.output_text.delete("1.0", "end")
-                self.output_text.insert("1.0", result)
-            except Exception as e:
-                self.show_error(f"Encryption error: {str(e)}")
+        self._start_job(decrypting=False)
     
     def perform_decrypt(self):
         """Perform decryption"""
+        self._start_job(decrypting=True)
+    
+    def _start_job(self, decrypting):
+        """Validate the inputs and hand the work to the background worker"""
+        action = "decrypt" if decrypting else "encrypt"
+        
+        # Ignore clicks while a job is still running (a cancelled job that
+        # is still stopping just delays the new one)
+        if self.current_job is not None:
+            return
+        
         if not self.current_cipher:
             self.show_error("Please select a cipher first")
             return
@@ -312,32 +310,78 @@ class CryptoApp(ctk.CTk):
         key = self.key_input.get().strip()
         
         if not text:
-            self.show_error("Please enter text to decrypt")
+            self.show_error(f"Please enter text to {action}")
             return
         
         if not key:
             self.show_error("Please enter a key")
             return
         
-        # Handle OTP with special parameters
-        if self.current_cipher_name == "One-Time Pad":
-            try:
-                mode = "letters" if self.otp_mode_var.get() == "Letters (A-Z)" else "xor"
-                fmt = self.otp_format_var.get() if mode == "xor" else "hex"  # fmt not used for letters mode
-                
-                result = self.current_cipher.decrypt(text, key, mode=mode, fmt=fmt)
-                self.output_text.delete("1.0", "end")
-                self.output_text.insert("1.0", result)
-            except Exception as e:
-                self.show_error(f"Decryption error: {str(e)}")
+        self.current_job = self.worker.submit(
+            self.current_cipher, decrypting, text, key, self._cipher_options())
+        self.current_action = "Decryption" if decrypting else "Encryption"
+        self._set_busy(True)
+        if not self.polling:
+            self.polling = True
+            self.after(POLL_INTERVAL, self._poll_job)
+    
+    def _set_busy(self, busy):
+        """Switch the buttons and progress bar between idle and running"""
+        state = "disabled" if busy else "normal"
+        self.encrypt_btn.configure(state=state)
+        self.decrypt_btn.configure(state=state)
+        
+        if not busy:
+            self.progress_bar.stop()
+            self.progress_frame.grid_remove()
+            return
+        
+        # Only chunked and streamed ciphers report real progress
+        self.progress_frame.grid()
+        self.show_progress = supports_progress(self.current_cipher, self._cipher_options())
+        if self.show_progress:
+            self.progress_bar.configure(mode="determinate")
+            self.progress_bar.set(0)
         else:
-            # Standard decryption for other ciphers
-            try:
-                result = self.current_cipher.decrypt(text, key)
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+    
+    def _poll_job(self):
+        """Apply worker events on the Tk main loop, rescheduling until the job ends"""
+        for job_id, kind, value in self.worker.poll():
+            if job_id != self.current_job:
+                continue  # Left over from a cancelled job
+            if kind == "progress":
+                if self.show_progress:
+                    self.progress_bar.set(value)
+                continue
+            
+            self.current_job = None
+            self._set_busy(False)
+            if kind == "done":
                 self.output_text.delete("1.0", "end")
-                self.output_text.insert("1.0", result)
-            except Exception as e:
-                self.show_error(f"Decryption error: {str(e)}")
+                self.output_text.insert("1.0", value)
+            elif kind == "error":
+                self.show_error(f"{self.current_action} error: {value}")
+            break
+        
+        # A single polling loop runs for as long as a job is active
+        self.polling = self.current_job is not None
+        if self.polling:
+            self.after(POLL_INTERVAL, self._poll_job)
+    
+    def cancel_job(self):
+        """Cancel the running job and return the UI to idle"""
+        if self.current_job is None:
+            return
+        self.worker.cancel()
+        self.current_job = None
+        self._set_busy(False)
+    
+    def on_close(self):
+        """Stop the background worker before closing the window"""
+        self.worker.shutdown()
+        self.destroy()
 
     def show_error(self, message):
         """Show error message in output"""
@@ -0,0 +1,206 @@
+"""
+Background Cipher Jobs
+Runs encrypt/decrypt off the Tk main loop and queues progress for the GUI to poll
+(no customtkinter import, so it can be used and tested headless)
+"""
+import binascii
+import io
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ciphers import registry
+
+# Characters (or bytes, for streamed ciphers) handed to the cipher per step
+CHUNK_SIZE = 64 * 1024
+
+# Streaming ciphers whose text API is their byte stream in another form:
+# 'text' is UTF-8 both ways, 'hex' is UTF-8 plain text and hex cipher text
+_STREAM_TEXT_FORMATS = {'vigenere': 'text', 'aes': 'hex'}
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once the user has cancelled it"""
+
+
+class _ProgressReader:
+    """In-memory binary reader that reports progress and checks for cancel on every read"""
+
+    def __init__(self, data, progress, check_cancel):
+        self._buffer = io.BytesIO(data)
+        self._size = max(len(data), 1)
+        self._progress = progress
+        self._check_cancel = check_cancel
+
+    def read(self, size=-1):
+        self._check_cancel()
+        data = self._buffer.read(size)
+        if self._progress:
+            self._progress(min(self._buffer.tell() / self._size, 1.0))
+        return data
+
+
+def supports_progress(cipher, options=None):
+    """
+    Return True if run_cipher reports progress and honours cancel for this cipher
+    Args:
+        cipher: Registered cipher name or Cipher instance
+        options: Extra cipher options (any option forces a single call)
+    """
+    if isinstance(cipher, str):
+        cipher = registry.get(cipher)
+    if options:
+        return False
+    return cipher.supports(registry.CHUNKED) or (
+        cipher.supports(registry.STREAMING) and cipher.name in _STREAM_TEXT_FORMATS)
+
+
+def _run_stream(cipher, decrypting, text, key, progress, check_cancel, chunk_size):
+    """Run a text job through the cipher's stream functions over in-memory buffers"""
+    text_format = _STREAM_TEXT_FORMATS[cipher.name]
+    action = "decryption" if decrypting else "encryption"
+    if decrypting and text_format == 'hex':
+        try:
+            data = binascii.unhexlify(text)
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"{cipher.label} {action} error: {e}")
+    else:
+        data = text.encode('utf-8')
+    
+    output = io.BytesIO()
+    process = cipher.decrypt_stream if decrypting else cipher.encrypt_stream
+    try:
+        process(_ProgressReader(data, progress, check_cancel), output,
+                cipher.compile_key(key), chunk_size=chunk_size)
+    except ValueError:
+        # Some ciphers wrap every error, JobCancelled included, in ValueError
+        check_cancel()
+        raise
+    
+    if text_format == 'hex' and not decrypting:
+        return binascii.hexlify(output.getvalue()).decode('ascii')
+    try:
+        return output.getvalue().decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise ValueError(f"{cipher.label} {action} error: {e}")
+
+
+def run_cipher(cipher, decrypting, text, key, options=None, progress=None,
+               cancel=None, chunk_size=CHUNK_SIZE):
+    """
+    Encrypt or decrypt text, in chunks when the cipher allows it
+    Chunked ciphers (Caesar, Monoalphabetic) and the streamed ones (AES,
+    Vigenère) report progress and honour cancel between chunks (see
+    supports_progress); every other cipher runs as a single call.
+    Args:
+        cipher: Registered cipher name or Cipher instance
+        decrypting: True to decrypt, False to encrypt
+        text: Input text
+        key: Cipher key
+        options: Extra cipher options (e.g. mode/fmt for OTP)
+        progress: Optional callback receiving the fraction done (0.0 - 1.0)
+        cancel: Optional threading.Event; once set the job raises JobCancelled
+        chunk_size: Characters processed per step
+    Returns:
+        Resulting text
+    """
+    if isinstance(cipher, str):
+        cipher = registry.get(cipher)
+    options = options or {}
+    process = cipher.decrypt if decrypting else cipher.encrypt
+
+    def check_cancel():
+        if cancel is not None and cancel.is_set():
+            raise JobCancelled("Cancelled")
+
+    if not supports_progress(cipher, options) or len(text) <= chunk_size:
+        check_cancel()
+        result = process(text, key, **options)
+        check_cancel()
+        if progress:
+            progress(1.0)
+        return result
+
+    if not cipher.supports(registry.CHUNKED):
+        return _run_stream(cipher, decrypting, text, key, progress, check_cancel,
+                           chunk_size)
+    
+    compiled = cipher.compile_key(key)
+    parts = []
+    for start in range(0, len(text), chunk_size):
+        check_cancel()
+        parts.append(process(text[start:start + chunk_size], compiled))
+        if progress:
+            progress(min(start + chunk_size, len(text)) / len(text))
+    return ''.join(parts)
+
+
+class CipherWorker:
+    """
+    Single background thread running one cipher job at a time
+
+    The worker never touches Tk widgets: it puts (job_id, kind, value)
+    events on a queue, where kind is 'progress', 'done', 'error' or
+    'cancelled', and the GUI drains them from the main loop with after().
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cipher-job")
+        self._lock = threading.Lock()
+        self._cancel = None
+        self._future = None
+        self.job_id = 0
+        self.events = queue.Queue()
+
+    def submit(self, cipher, decrypting, text, key, options=None, chunk_size=CHUNK_SIZE):
+        """
+        Start a job in the background
+        Returns:
+            The job id tagging every event of this job
+        Raises:
+            RuntimeError: If a job is already running (a cancelled job that is
+                still stopping does not count: the new job queues behind it)
+        """
+        with self._lock:
+            if (self._future is not None and not self._future.done()
+                    and not self._cancel.is_set()):
+                raise RuntimeError("A job is already running")
+            self.job_id += 1
+            self._cancel = threading.Event()
+            self._future = self._executor.submit(
+                self._run, self.job_id, self._cancel, cipher, decrypting, text, key,
+                options, chunk_size)
+            return self.job_id
+
+    def cancel(self):
+        """Ask the running job to stop (its result is discarded either way)"""
+        with self._lock:
+            if self._cancel is not None:
+                self._cancel.set()
+
+    def poll(self):
+        """Return every event queued since the last call"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self):
+        """Cancel any running job and stop the background thread"""
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _run(self, job_id, cancel, cipher, decrypting, text, key, options, chunk_size):
+        def report(fraction):
+            self.events.put((job_id, 'progress', fraction))
+
+        try:
+            result = run_cipher(cipher, decrypting, text, key, options, report, cancel,
+                                chunk_size)
+        except JobCancelled:
+            self.events.put((job_id, 'cancelled', None))
+        except Exception as e:
+            self.events.put((job_id, 'error', str(e)))
+        else:
+            self.events.put((job_id, 'done', result))
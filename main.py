@@ -1,8 +1,18 @@
 """
 Cryptography GUI Application
-Main entry point
+Main entry point (any arguments are handed to the command-line interface)
 """
-from gui.app_gui import run_app
+import sys
+
+
+def run_app():
+    """Launch the GUI (customtkinter is only imported here)"""
+    from gui.app_gui import run_app as run_gui
+    run_gui()
+
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        from cryptotool.cli import main
+        sys.exit(main())
     run_app()